@@ -247,7 +247,7 @@ def example_order_management():
     
     print("\n2. 提交订单...")
     order_manager.submit_order(market_order.order_id)
-    print(f"订单状态: {market_order.status.value}")
+    print(f"订单状态: {market_order.to_dict()['status']}")
     
     print("\n3. 成交订单...")
     order_manager.fill_order(
@@ -256,7 +256,7 @@ def example_order_management():
         filled_price=10.2,
         commission=5.0
     )
-    print(f"订单状态: {market_order.status.value}")
+    print(f"订单状态: {market_order.to_dict()['status']}")
     print(f"成交数量: {market_order.filled_quantity}")
     print(f"成交价格: {market_order.filled_price}")
     
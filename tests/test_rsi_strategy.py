@@ -0,0 +1,57 @@
+"""
+RSI策略测试
+"""
+import numpy as np
+import pandas as pd
+
+from victoryquant.strategy.examples.rsi_strategy import RSIStrategy, _rsi_core, _rsi_multi
+
+
+def _reference_rsi(close: np.ndarray, period: int) -> np.ndarray:
+    delta = pd.Series(close).diff()
+    gain = delta.where(delta > 0, 0).fillna(0)
+    loss = (-delta.where(delta < 0, 0)).fillna(0)
+    rsi = 100 - 100 / (1 + gain.rolling(period).mean() / loss.rolling(period).mean())
+    return rsi.replace([np.inf, -np.inf], np.nan).to_numpy()
+
+
+def _halted_closes(n_series: int = 200, n_bars: int = 300) -> np.ndarray:
+    rng = np.random.default_rng(7)
+    closes = np.empty((n_series, n_bars))
+    for row in range(n_series):
+        scale = rng.choice([1.0, 10.0, 100.0, 3000.0])
+        vol = rng.choice([0.001, 0.02, 0.08])
+        close = scale * np.exp(np.cumsum(rng.normal(0, vol, n_bars)))
+        start = rng.integers(20, 250)
+        close[start:start + rng.integers(14, 40)] = close[start]
+        closes[row] = close
+    return closes
+
+
+def test_rsi_matches_pandas_through_halts():
+    for close in _halted_closes():
+        rsi, _, _ = _rsi_core(close, 14, 30.0, 70.0)
+        np.testing.assert_allclose(rsi, _reference_rsi(close, 14), atol=1e-6, equal_nan=True)
+
+
+def test_rsi_multi_matches_single_through_halts():
+    closes = _halted_closes(50)
+    rsi, crosses = _rsi_multi(closes, 14, 30.0, 70.0)
+    for row, close in enumerate(closes):
+        expected, buy_idx, sell_idx = _rsi_core(close, 14, 30.0, 70.0)
+        np.testing.assert_array_equal(rsi[row], expected)
+        np.testing.assert_array_equal(np.flatnonzero(crosses[row] == 1), buy_idx)
+        np.testing.assert_array_equal(np.flatnonzero(crosses[row] == -1), sell_idx)
+
+
+def test_generate_signals_with_flat_stretch():
+    index = pd.date_range('2020-01-01', periods=120, freq='B')
+    close = 10 + np.cumsum(np.random.default_rng(1).normal(0, 0.2, 120))
+    close[40:80] = close[40]
+    data = pd.DataFrame({'close': close}, index=index)
+
+    single = RSIStrategy().generate_signals(data)
+    multi = RSIStrategy().generate_signals_multi({'A': data})['A']
+    assert [(s.signal_type, s.timestamp) for s in single] == \
+           [(s.signal_type, s.timestamp) for s in multi]
+    assert all(not (index[54] <= s.timestamp < index[80]) for s in single)
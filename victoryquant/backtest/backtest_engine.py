@@ -43,11 +43,10 @@ class BacktestEngine:
         if data.empty:
             return {'error': '数据为空'}
         
-        signals = strategy.generate_signals(data)
-        
         if symbol:
-            for signal in signals:
-                signal.symbol = symbol
+            signals = strategy.generate_signal_for_symbol(symbol, data)
+        else:
+            signals = strategy.generate_signals(data)
         
         for idx, row in data.iterrows():
             current_date = idx if isinstance(idx, datetime) else pd.to_datetime(idx)
@@ -66,9 +65,7 @@ class BacktestEngine:
         all_signals = []
         
         for symbol, data in data_dict.items():
-            signals = strategy.generate_signals(data)
-            for signal in signals:
-                signal.symbol = symbol
+            signals = strategy.generate_signal_for_symbol(symbol, data)
             all_signals.extend(signals)
         
         all_signals.sort(key=lambda x: x.timestamp)
@@ -81,19 +78,24 @@ class BacktestEngine:
                 common_dates = common_dates.intersection(set(data.index))
         
         common_dates = sorted(list(common_dates))
+        closes = {
+            symbol: dict(zip(data.index, data['close'].to_numpy()))
+            for symbol, data in data_dict.items()
+        }
         
         for date in common_dates:
-            current_signals = [s for s in all_signals if s.timestamp == date]
+            timestamp = np.datetime64(date, 'ns')
+            current_signals = [s for s in all_signals if s.timestamp == timestamp]
             
-            for symbol, data in data_dict.items():
-                if date in data.index:
-                    current_price = data.loc[date, 'close']
+            for symbol_closes in closes.values():
+                current_price = symbol_closes.get(date)
+                if current_price is not None:
                     self._process_signals(current_signals, date, current_price)
             
             total_value = self.cash
             for sym, pos in self.positions.items():
-                if sym in data_dict and date in data_dict[sym].index:
-                    price = data_dict[sym].loc[date, 'close']
+                price = closes[sym].get(date) if sym in closes else None
+                if price is not None:
                     total_value += pos['quantity'] * price
             
             self.daily_values.append({
@@ -107,8 +109,9 @@ class BacktestEngine:
     
     def _process_signals(self, signals: List[Signal], current_date: datetime, 
                         current_price: float):
+        current_day = np.datetime64(current_date, 'D')
         for signal in signals:
-            if signal.timestamp.date() != current_date.date():
+            if signal.timestamp.astype('datetime64[D]') != current_day:
                 continue
             
             if signal.signal_type == SignalType.BUY:
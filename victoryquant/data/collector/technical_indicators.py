@@ -6,6 +6,26 @@ import numpy as np
 from typing import Dict, List, Tuple, Optional
 
 
+def _cross_flags(fast: pd.Series, slow: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    f = fast.to_numpy(dtype=np.float64)
+    s = slow.to_numpy(dtype=np.float64)
+    golden = np.zeros(len(f), dtype=int)
+    death = np.zeros(len(f), dtype=int)
+    if len(f) < 2:
+        return golden, death
+    
+    operands = {'f': f[1:], 's': s[1:], 'fp': f[:-1], 'sp': s[:-1]}
+    try:
+        import numexpr as ne
+        golden[1:] = ne.evaluate("(f > s) & (fp <= sp)", local_dict=operands)
+        death[1:] = ne.evaluate("(f < s) & (fp >= sp)", local_dict=operands)
+    except ImportError:
+        golden[1:] = (operands['f'] > operands['s']) & (operands['fp'] <= operands['sp'])
+        death[1:] = (operands['f'] < operands['s']) & (operands['fp'] >= operands['sp'])
+    
+    return golden, death
+
+
 class TechnicalIndicatorCalculator:
     def __init__(self):
         pass
@@ -191,19 +211,15 @@ class TechnicalIndicatorCalculator:
         fast_ma = result[f'MA{fast_period}']
         slow_ma = result[f'MA{slow_period}']
         
-        result['GOLDEN_CROSS'] = ((fast_ma > slow_ma) & 
-                                  (fast_ma.shift(1) <= slow_ma.shift(1))).astype(int)
-        result['DEATH_CROSS'] = ((fast_ma < slow_ma) & 
-                                 (fast_ma.shift(1) >= slow_ma.shift(1))).astype(int)
+        result['GOLDEN_CROSS'], result['DEATH_CROSS'] = _cross_flags(fast_ma, slow_ma)
         
         return result
     
     def detect_macd_signal(self, data: pd.DataFrame) -> pd.DataFrame:
         result = data.copy()
         
-        result['MACD_GOLDEN_CROSS'] = ((result['MACD'] > result['MACD_Signal']) & 
-                                       (result['MACD'].shift(1) <= result['MACD_Signal'].shift(1))).astype(int)
-        result['MACD_DEATH_CROSS'] = ((result['MACD'] < result['MACD_Signal']) & 
-                                      (result['MACD'].shift(1) >= result['MACD_Signal'].shift(1))).astype(int)
+        result['MACD_GOLDEN_CROSS'], result['MACD_DEATH_CROSS'] = _cross_flags(
+            result['MACD'], result['MACD_Signal']
+        )
         
         return result
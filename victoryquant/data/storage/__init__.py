@@ -2,6 +2,6 @@
 数据存储模块
 """
 from .database import DatabaseManager
-from .file_storage import FileStorage
+from .file_storage import FileStorage, ColumnarRecords
 
-__all__ = ['DatabaseManager', 'FileStorage']
+__all__ = ['DatabaseManager', 'FileStorage', 'ColumnarRecords']
@@ -3,18 +3,130 @@
 """
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Callable, Iterator
 from datetime import datetime
+import atexit
+import codecs
+import fnmatch
+import functools
 import json
 import os
 import pickle
+import queue
+import re
+import struct
+import sys
+import threading
 import csv
 
+from ...utils.columnar import RecordSequence
+
+
+_IO_BUFFER_SIZE = 1 << 20
+_PICKLE_MAGIC = b'VQPKL5\n'
+_PICKLE_HEADER = struct.Struct('<QQ')
+_STOCK_ROW_GROUP_SIZE = 22
+_GLOB_CHARS = frozenset('*?[')
+_WRITE_QUEUE_SIZE = 1024
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_pattern(pattern: str) -> Callable[[str], Any]:
+    if _GLOB_CHARS.intersection(pattern):
+        return re.compile(fnmatch.translate(pattern)).match
+    return re.compile(re.escape(pattern)).search
+
+
+def _deferrable(method: Callable) -> Callable:
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._write_queue is None or threading.current_thread() is self._writer:
+            return method(self, *args, **kwargs)
+        self._write_queue.put((method, args, kwargs))
+    
+    return wrapper
+
+
+class ColumnarRecords(RecordSequence):
+    def __init__(self, df: pd.DataFrame):
+        self.columns = list(df.columns)
+        self._arrays = [df[col].to_numpy() for col in self.columns]
+        self._length = len(df)
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    def _materialize(self, i: int) -> Dict[str, Any]:
+        record = {}
+        for col, values in zip(self.columns, self._arrays):
+            value = values[i]
+            record[col] = value.item() if isinstance(value, np.generic) else value
+        return record
+    
+    def column(self, name: str) -> np.ndarray:
+        return self._arrays[self.columns.index(name)]
+    
+    def to_dataframe(self) -> pd.DataFrame:
+        return pd.DataFrame(dict(zip(self.columns, self._arrays)), columns=self.columns)
+
 
 class FileStorage:
-    def __init__(self, base_dir: str = "data"):
+    def __init__(self, base_dir: str = "data", 
+                 remote_prefixes: tuple = ("s3://", "/mnt/"),
+                 async_writes: bool = False, use_pyarrow_csv: bool = False):
         self.base_dir = base_dir
+        self.remote_prefixes = tuple(remote_prefixes)
+        self.use_pyarrow_csv = use_pyarrow_csv
         self._ensure_dir(base_dir)
+        
+        self._write_queue = None
+        self._writer = None
+        self._write_errors = []
+        if async_writes:
+            self._write_queue = queue.Queue(maxsize=_WRITE_QUEUE_SIZE)
+            self._writer = threading.Thread(target=self._write_loop, 
+                                            name="FileStorageWriter", daemon=True)
+            self._writer.start()
+            atexit.register(self.close)
+    
+    def _write_loop(self):
+        while True:
+            task = self._write_queue.get()
+            if task is None:
+                self._write_queue.task_done()
+                return
+            
+            method, args, kwargs = task
+            try:
+                method(self, *args, **kwargs)
+            except Exception as e:
+                self._write_errors.append(e)
+            finally:
+                self._write_queue.task_done()
+    
+    def flush(self):
+        if self._write_queue is None:
+            return
+        
+        self._write_queue.join()
+        
+        if self._write_errors:
+            errors, self._write_errors = self._write_errors, []
+            raise errors[0]
+    
+    def close(self):
+        if self._write_queue is None:
+            return
+        
+        atexit.unregister(self.close)
+        self._write_queue.put(None)
+        self._writer.join()
+        self._write_queue = None
+        self._writer = None
+        
+        if self._write_errors:
+            errors, self._write_errors = self._write_errors, []
+            raise errors[0]
     
     def _ensure_dir(self, path: str):
         if not os.path.exists(path):
@@ -25,8 +137,45 @@ class FileStorage:
         self._ensure_dir(os.path.dirname(path))
         return path
     
+    def _write_csv_arrow(self, df: pd.DataFrame, path: str) -> bool:
+        if isinstance(df.columns, pd.MultiIndex):
+            return False
+        
+        try:
+            import pyarrow as pa
+            from pyarrow import csv as pa_csv
+            
+            table = pa.Table.from_pandas(df, preserve_index=True)
+            n_data = table.num_columns - df.index.nlevels
+            table = table.select(list(range(n_data, table.num_columns)) + list(range(n_data)))
+            names = [name if name is not None else '' for name in df.index.names]
+            table = table.rename_columns(names + table.column_names[len(names):])
+            
+            with open(path, 'wb', buffering=_IO_BUFFER_SIZE) as f:
+                f.write(codecs.BOM_UTF8)
+                pa_csv.write_csv(table, f, write_options=pa_csv.WriteOptions(
+                    include_header=True, quoting_style="needed"))
+            return True
+        except Exception:
+            return False
+    
+    def _read_csv_arrow(self, path: str) -> Optional[pd.DataFrame]:
+        try:
+            from pyarrow import csv as pa_csv
+            df = pa_csv.read_csv(path).to_pandas(self_destruct=True)
+        except Exception:
+            return None
+        
+        df.columns = [name if name != '' else f"Unnamed: {i}" 
+                      for i, name in enumerate(df.columns)]
+        return df
+    
+    @_deferrable
     def save_dataframe(self, df: pd.DataFrame, filename: str, 
-                      subdir: str = None, format: str = "csv"):
+                      subdir: str = None, format: str = "csv",
+                      compression: Optional[str] = "zstd", compression_level: Optional[int] = None,
+                      row_group_size: int = 128_000,
+                      use_dictionary: Optional[List[str]] = None):
         if subdir:
             path = self._get_path(subdir, filename)
         else:
@@ -34,10 +183,20 @@ class FileStorage:
         
         if format == "csv":
             path = path if path.endswith('.csv') else f"{path}.csv"
-            df.to_csv(path, encoding='utf-8-sig')
+            if not (self.use_pyarrow_csv and self._write_csv_arrow(df, path)):
+                df.to_csv(path, encoding='utf-8-sig')
         elif format == "parquet":
             path = path if path.endswith('.parquet') else f"{path}.parquet"
-            df.to_parquet(path)
+            options = {} if use_dictionary is None else {'use_dictionary': use_dictionary}
+            if compression_level is not None:
+                options['compression_level'] = compression_level
+            df.to_parquet(path, engine="pyarrow", compression=compression,
+                          row_group_size=row_group_size, **options)
+        elif format == "feather":
+            import pyarrow as pa
+            from pyarrow import feather
+            path = path if path.endswith('.feather') else f"{path}.feather"
+            feather.write_feather(pa.Table.from_pandas(df), path, compression='uncompressed')
         elif format == "hdf":
             path = path if path.endswith('.h5') else f"{path}.h5"
             df.to_hdf(path, key='data', mode='w')
@@ -49,7 +208,8 @@ class FileStorage:
             df.to_excel(path)
     
     def load_dataframe(self, filename: str, subdir: str = None, 
-                      format: str = "csv") -> pd.DataFrame:
+                      format: str = "csv", columns: Optional[List[str]] = None,
+                      pre_buffer: Optional[bool] = None) -> pd.DataFrame:
         if subdir:
             path = self._get_path(subdir, filename)
         else:
@@ -57,10 +217,27 @@ class FileStorage:
         
         if format == "csv":
             path = path if path.endswith('.csv') else f"{path}.csv"
+            if self.use_pyarrow_csv:
+                df = self._read_csv_arrow(path)
+                if df is not None:
+                    return df
             return pd.read_csv(path, encoding='utf-8-sig')
         elif format == "parquet":
             path = path if path.endswith('.parquet') else f"{path}.parquet"
-            return pd.read_parquet(path)
+            if pre_buffer is None:
+                pre_buffer = path.startswith(self.remote_prefixes)
+            if pre_buffer:
+                import pyarrow.parquet as pq
+                table = pq.read_table(path, columns=columns, pre_buffer=True,
+                                      coerce_int96_timestamp_unit='ns')
+                return table.to_pandas()
+            return pd.read_parquet(path, columns=columns)
+        elif format == "feather":
+            import pyarrow as pa
+            from pyarrow import feather
+            path = path if path.endswith('.feather') else f"{path}.feather"
+            table = feather.read_table(pa.memory_map(path))
+            return table.to_pandas(split_blocks=True, self_destruct=True)
         elif format == "hdf":
             path = path if path.endswith('.h5') else f"{path}.h5"
             return pd.read_hdf(path, key='data')
@@ -73,6 +250,7 @@ class FileStorage:
         
         return pd.DataFrame()
     
+    @_deferrable
     def save_json(self, data: Dict, filename: str, subdir: str = None):
         if subdir:
             path = self._get_path(subdir, filename)
@@ -97,7 +275,9 @@ class FileStorage:
                 return json.load(f)
         return {}
     
-    def save_pickle(self, obj: Any, filename: str, subdir: str = None):
+    @_deferrable
+    def save_pickle(self, obj: Any, filename: str, subdir: str = None,
+                    out_of_band: bool = False):
         if subdir:
             path = self._get_path(subdir, filename)
         else:
@@ -105,8 +285,22 @@ class FileStorage:
         
         path = path if path.endswith('.pkl') else f"{path}.pkl"
         
-        with open(path, 'wb') as f:
-            pickle.dump(obj, f)
+        buffers = []
+        buffer_callback = (lambda buf: buffers.append(buf.raw())) if out_of_band else None
+        payload = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL,
+                               buffer_callback=buffer_callback)
+        
+        with open(path, 'wb', buffering=_IO_BUFFER_SIZE) as f:
+            if not buffers:
+                f.write(payload)
+                return
+            
+            f.write(_PICKLE_MAGIC)
+            f.write(_PICKLE_HEADER.pack(len(buffers), len(payload)))
+            f.write(struct.pack(f'<{len(buffers)}Q', *(buf.nbytes for buf in buffers)))
+            f.write(payload)
+            for buf in buffers:
+                f.write(buf)
     
     def load_pickle(self, filename: str, subdir: str = None) -> Any:
         if subdir:
@@ -116,10 +310,56 @@ class FileStorage:
         
         path = path if path.endswith('.pkl') else f"{path}.pkl"
         
-        if os.path.exists(path):
-            with open(path, 'rb') as f:
-                return pickle.load(f)
-        return None
+        if not os.path.exists(path):
+            return None
+        
+        with open(path, 'rb') as f:
+            data = bytearray(os.fstat(f.fileno()).st_size)
+            f.readinto(data)
+        
+        view = memoryview(data)
+        if view[:len(_PICKLE_MAGIC)] != _PICKLE_MAGIC:
+            return pickle.loads(view)
+        
+        offset = len(_PICKLE_MAGIC)
+        count, payload_size = _PICKLE_HEADER.unpack_from(view, offset)
+        offset += _PICKLE_HEADER.size
+        sizes = struct.unpack_from(f'<{count}Q', view, offset)
+        offset += 8 * count
+        payload = view[offset:offset + payload_size]
+        offset += payload_size
+        
+        buffers = []
+        for size in sizes:
+            buffers.append(view[offset:offset + size])
+            offset += size
+        
+        return pickle.loads(payload, buffers=buffers)
+    
+    @_deferrable
+    def save_npy(self, array: np.ndarray, filename: str, subdir: str = None):
+        if subdir:
+            path = self._get_path(subdir, filename)
+        else:
+            path = self._get_path(filename)
+        
+        path = path if path.endswith('.npy') else f"{path}.npy"
+        
+        with open(path, 'wb', buffering=_IO_BUFFER_SIZE) as f:
+            np.save(f, array, allow_pickle=False)
+    
+    def load_npy(self, filename: str, subdir: str = None,
+                 mmap_mode: Optional[str] = None) -> Optional[np.ndarray]:
+        if subdir:
+            path = self._get_path(subdir, filename)
+        else:
+            path = self._get_path(filename)
+        
+        path = path if path.endswith('.npy') else f"{path}.npy"
+        
+        if not os.path.exists(path):
+            return None
+        return np.load(path, mmap_mode=mmap_mode, allow_pickle=False)
     
     def save_text(self, text: str, filename: str, subdir: str = None):
         if subdir:
@@ -141,21 +381,24 @@ class FileStorage:
                 return f.read()
         return ""
     
-    def list_files(self, subdir: str = None, pattern: str = None) -> List[str]:
+    def iter_files(self, subdir: str = None, pattern: str = None) -> Iterator[str]:
         if subdir:
             path = self._get_path(subdir)
         else:
             path = self.base_dir
         
         if not os.path.exists(path):
-            return []
-        
-        files = os.listdir(path)
+            return
         
-        if pattern:
-            files = [f for f in files if pattern in f]
+        match = _compile_pattern(pattern) if pattern else None
         
-        return files
+        with os.scandir(path) as it:
+            for entry in it:
+                if match is None or match(entry.name):
+                    yield entry.name
+    
+    def list_files(self, subdir: str = None, pattern: str = None) -> List[str]:
+        return list(self.iter_files(subdir, pattern))
     
     def delete_file(self, filename: str, subdir: str = None):
         if subdir:
@@ -192,15 +435,30 @@ class FileStorage:
         return {}
     
     def save_stock_data(self, symbol: str, data: pd.DataFrame, 
-                       data_type: str = "daily"):
+                       data_type: str = "daily", ipc: bool = False,
+                       format: str = "csv"):
+        symbol = sys.intern(symbol)
         subdir = os.path.join("stocks", symbol)
-        filename = f"{data_type}.csv"
-        self.save_dataframe(data, filename, subdir)
+        if ipc:
+            format = "feather"
+        
+        if format != "csv" and 'symbol' in data.columns and \
+                not isinstance(data['symbol'].dtype, pd.CategoricalDtype):
+            data = data.assign(symbol=data['symbol'].astype('category'))
+        
+        if format == "parquet":
+            self.save_dataframe(data, data_type, subdir, format=format,
+                                row_group_size=_STOCK_ROW_GROUP_SIZE,
+                                use_dictionary=['symbol'] if 'symbol' in data.columns else None)
+        else:
+            self.save_dataframe(data, data_type, subdir, format=format)
     
-    def load_stock_data(self, symbol: str, data_type: str = "daily") -> pd.DataFrame:
+    def load_stock_data(self, symbol: str, data_type: str = "daily",
+                        ipc: bool = False, format: str = "csv") -> pd.DataFrame:
         subdir = os.path.join("stocks", symbol)
-        filename = f"{data_type}.csv"
-        return self.load_dataframe(filename, subdir)
+        if ipc:
+            format = "feather"
+        return self.load_dataframe(data_type, subdir, format=format)
     
     def save_backtest_result(self, strategy_name: str, result: Dict):
         subdir = os.path.join("backtest", strategy_name)
@@ -226,7 +484,7 @@ class FileStorage:
         
         trades_path = self._get_path(subdir, "trades.csv")
         if os.path.exists(trades_path):
-            result['trades'] = self.load_dataframe("trades.csv", subdir).to_dict('records')
+            result['trades'] = ColumnarRecords(self.load_dataframe("trades.csv", subdir))
         
         perf_path = self._get_path(subdir, "performance.csv")
         if os.path.exists(perf_path):
@@ -234,7 +492,8 @@ class FileStorage:
         
         daily_path = self._get_path(subdir, "daily_values.csv")
         if os.path.exists(daily_path):
-            result['daily_values'] = self.load_dataframe("daily_values.csv", subdir).to_dict('records')
+            daily_df = self.load_dataframe("daily_values.csv", subdir)
+            result['daily_values'] = ColumnarRecords(daily_df)
         
         result['metrics'] = self.load_json("metrics.json", subdir)
         
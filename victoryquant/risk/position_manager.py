@@ -1,11 +1,18 @@
 """
 仓位管理器
 """
+import sys
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional
 from datetime import datetime
 from dataclasses import dataclass
+from operator import attrgetter
+
+
+_POSITION_FIELDS = ('symbol', 'quantity', 'avg_cost', 'current_price',
+                    'market_value', 'profit_loss', 'profit_loss_ratio')
+_get_position_values = attrgetter(*_POSITION_FIELDS)
 
 
 @dataclass
@@ -19,15 +26,7 @@ class Position:
     profit_loss_ratio: float
     
     def to_dict(self) -> Dict:
-        return {
-            'symbol': self.symbol,
-            'quantity': self.quantity,
-            'avg_cost': self.avg_cost,
-            'current_price': self.current_price,
-            'market_value': self.market_value,
-            'profit_loss': self.profit_loss,
-            'profit_loss_ratio': self.profit_loss_ratio
-        }
+        return dict(zip(_POSITION_FIELDS, _get_position_values(self)))
 
 
 class PositionManager:
@@ -40,6 +39,8 @@ class PositionManager:
         if symbol not in self.positions or self.positions[symbol]['quantity'] <= 0:
             return None
         
+        symbol = sys.intern(symbol)
+        
         pos = self.positions[symbol]
         return Position(
             symbol=symbol,
@@ -91,6 +92,7 @@ class PositionManager:
         return total
     
     def update_position(self, symbol: str, quantity: int, price: float, is_buy: bool):
+        symbol = sys.intern(symbol)
         if symbol not in self.positions:
             self.positions[symbol] = {
                 'quantity': 0,
@@ -202,6 +204,7 @@ class PositionManager:
         return adjustments
     
     def clear_position(self, symbol: str, price: float) -> float:
+        symbol = sys.intern(symbol)
         if symbol not in self.positions:
             return 0
         
@@ -4,17 +4,69 @@
 import pandas as pd
 import numpy as np
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
-from datetime import datetime
+from typing import Dict, List, Optional, Any, Sequence
 from .signal import Signal, SignalType
+from ...utils.columnar import GrowableArray, RecordSequence
+
+
+_NO_QUANTITY = -1
+_SIGNAL_DTYPE = np.dtype([
+    ('symbol', object),
+    ('type', np.int8),
+    ('price', np.float64),
+    ('timestamp', 'datetime64[ns]'),
+    ('strength', np.float64),
+    ('quantity', np.int64)
+])
+STRATEGY_BACKENDS = ('numba', 'polars')
+
+
+class _SignalStore(RecordSequence):
+    def __init__(self, capacity: int = 64):
+        self._records = GrowableArray(_SIGNAL_DTYPE, capacity)
+        self._metadata = []
+    
+    def append(self, signal: Signal):
+        quantity = _NO_QUANTITY if signal.quantity is None else signal.quantity
+        self._records.append((signal.symbol, signal.signal_type, signal.price, signal.timestamp,
+                              signal.strength, quantity))
+        self._metadata.append(signal.metadata)
+    
+    def _materialize(self, i: int) -> Signal:
+        record = self._records.values[i]
+        quantity = record['quantity']
+        return Signal(
+            symbol=record['symbol'],
+            signal_type=SignalType(record['type']),
+            price=record['price'],
+            timestamp=record['timestamp'],
+            strength=record['strength'],
+            quantity=None if quantity == _NO_QUANTITY else int(quantity),
+            metadata=self._metadata[i]
+        )
+    
+    def __len__(self) -> int:
+        return len(self._records)
+    
+    def select(self, symbol: str) -> List[Signal]:
+        rows = np.flatnonzero(self._records.values['symbol'] == symbol)
+        return [self._materialize(i) for i in rows]
+    
+    def set_symbol(self, start: int, symbol: str):
+        self._records.values['symbol'][start:] = symbol
 
 
 class BaseStrategy(ABC):
-    def __init__(self, name: str, params: Dict = None):
+    def __init__(self, name: str, params: Dict = None, backend: str = 'numba'):
+        if backend not in STRATEGY_BACKENDS:
+            raise ValueError(f"不支持的指标计算后端: {backend}")
+        
         self.name = name
         self.params = params or {}
+        self.backend = backend
         self.positions = {}
-        self.signals_history = []
+        self._active = {}
+        self.signals_history = _SignalStore()
         self._validate_params()
     
     def _validate_params(self):
@@ -30,29 +82,59 @@ class BaseStrategy(ABC):
     def generate_signals(self, data: pd.DataFrame) -> List[Signal]:
         pass
     
+    @staticmethod
+    def _index_timestamps(index: pd.Index) -> np.ndarray:
+        if isinstance(index, pd.DatetimeIndex):
+            return index.to_numpy(dtype='datetime64[ns]')
+        return np.full(len(index), np.datetime64('now', 'ns'))
+    
+    @staticmethod
+    def _stack_closes(data_dict: Dict[str, pd.DataFrame]):
+        symbols = list(data_dict)
+        lengths = [len(data_dict[symbol]) for symbol in symbols]
+        closes = np.full((len(symbols), max(lengths, default=0)), np.nan)
+        for row, symbol in enumerate(symbols):
+            if lengths[row]:
+                closes[row, :lengths[row]] = data_dict[symbol]['close'].to_numpy(dtype=np.float64)
+        return symbols, closes, lengths
+    
+    def generate_signal_for_symbol(self, symbol: str, data: pd.DataFrame) -> List[Signal]:
+        start = len(self.signals_history)
+        signals = self.generate_signals(data)
+        
+        for signal in signals:
+            signal.symbol = symbol
+        self.signals_history.set_symbol(start, symbol)
+        
+        return signals
+    
     def update_positions(self, symbol: str, quantity: int, price: float):
-        if symbol not in self.positions:
-            self.positions[symbol] = {
+        pos = self.positions.get(symbol)
+        if pos is None:
+            pos = {
                 'quantity': 0,
                 'avg_cost': 0,
                 'total_cost': 0
             }
-        
-        pos = self.positions[symbol]
+            self.positions[symbol] = pos
         
         if quantity > 0:
-            pos['total_cost'] += quantity * price
-            pos['quantity'] += quantity
-            pos['avg_cost'] = pos['total_cost'] / pos['quantity'] if pos['quantity'] > 0 else 0
+            held = pos['quantity'] + quantity
+            total_cost = pos['total_cost'] + quantity * price
+            pos['quantity'] = held
+            pos['total_cost'] = total_cost
+            pos['avg_cost'] = total_cost / held
+            self._active[symbol] = None
         else:
-            sell_quantity = abs(quantity)
-            if sell_quantity >= pos['quantity']:
+            held = pos['quantity'] + quantity
+            if held <= 0:
                 pos['quantity'] = 0
                 pos['total_cost'] = 0
                 pos['avg_cost'] = 0
+                self._active.pop(symbol, None)
             else:
-                pos['quantity'] -= sell_quantity
-                pos['total_cost'] = pos['quantity'] * pos['avg_cost']
+                pos['quantity'] = held
+                pos['total_cost'] = held * pos['avg_cost']
     
     def get_position(self, symbol: str) -> Dict:
         return self.positions.get(symbol, {'quantity': 0, 'avg_cost': 0, 'total_cost': 0})
@@ -61,21 +143,23 @@ class BaseStrategy(ABC):
         return self.get_position(symbol)['quantity'] > 0
     
     def get_all_positions(self) -> Dict:
-        return {k: v for k, v in self.positions.items() if v['quantity'] > 0}
+        return {symbol: self.positions[symbol] for symbol in self._active}
     
     def clear_position(self, symbol: str):
         if symbol in self.positions:
             self.positions[symbol] = {'quantity': 0, 'avg_cost': 0, 'total_cost': 0}
+            self._active.pop(symbol, None)
     
     def clear_all_positions(self):
         self.positions = {}
+        self._active = {}
     
     def record_signal(self, signal: Signal):
         self.signals_history.append(signal)
     
-    def get_signals_history(self, symbol: str = None) -> List[Signal]:
+    def get_signals_history(self, symbol: str = None) -> Sequence[Signal]:
         if symbol:
-            return [s for s in self.signals_history if s.symbol == symbol]
+            return self.signals_history.select(symbol)
         return self.signals_history
     
     def calculate_position_size(self, symbol: str, price: float, 
@@ -88,55 +172,57 @@ class BaseStrategy(ABC):
         
         return max(quantity, min_unit)
     
-    def apply_stop_loss(self, data: pd.DataFrame, stop_loss_ratio: float = 0.08) -> List[Signal]:
-        signals = []
+    def _position_ratios(self, data: pd.DataFrame):
+        held = [(symbol, self.positions[symbol]) for symbol in self._active]
+        if not held or 'close' not in data.columns:
+            return None
         
-        for symbol, pos in self.positions.items():
-            if pos['quantity'] > 0:
-                if symbol in data.index:
-                    current_price = data.loc[symbol, 'close'] if 'close' in data.columns else None
-                    
-                    if current_price:
-                        loss_ratio = (current_price - pos['avg_cost']) / pos['avg_cost']
-                        
-                        if loss_ratio <= -stop_loss_ratio:
-                            signal = Signal(
-                                symbol=symbol,
-                                signal_type=SignalType.SELL,
-                                price=current_price,
-                                timestamp=datetime.now(),
-                                strength=1.0,
-                                quantity=pos['quantity'],
-                                metadata={'reason': 'stop_loss', 'loss_ratio': loss_ratio}
-                            )
-                            signals.append(signal)
+        n = len(held)
+        symbols = np.fromiter((symbol for symbol, _ in held), dtype=object, count=n)
+        avg_costs = np.fromiter((pos['avg_cost'] for _, pos in held), dtype=np.float64, count=n)
+        quantities = [pos['quantity'] for _, pos in held]
+        prices = data['close'].reindex(symbols).to_numpy(dtype=np.float64)
         
-        return signals
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratios = (prices - avg_costs) / avg_costs
+        
+        return symbols, prices, ratios, quantities
+    
+    def _exit_signals(self, rows, symbols, prices, ratios, quantities,
+                      reason: str, ratio_key: str) -> List[Signal]:
+        timestamp = np.datetime64('now', 'ns')
+        return [
+            Signal(
+                symbol=symbols[i],
+                signal_type=SignalType.SELL,
+                price=prices[i],
+                timestamp=timestamp,
+                strength=1.0,
+                quantity=quantities[i],
+                metadata={'reason': reason, ratio_key: ratios[i]}
+            )
+            for i in rows
+        ]
     
-    def apply_take_profit(self, data: pd.DataFrame, take_profit_ratio: float = 0.15) -> List[Signal]:
-        signals = []
+    def apply_stop_loss(self, data: pd.DataFrame, stop_loss_ratio: float = 0.08) -> List[Signal]:
+        columns = self._position_ratios(data)
+        if columns is None:
+            return []
         
-        for symbol, pos in self.positions.items():
-            if pos['quantity'] > 0:
-                if symbol in data.index:
-                    current_price = data.loc[symbol, 'close'] if 'close' in data.columns else None
-                    
-                    if current_price:
-                        profit_ratio = (current_price - pos['avg_cost']) / pos['avg_cost']
-                        
-                        if profit_ratio >= take_profit_ratio:
-                            signal = Signal(
-                                symbol=symbol,
-                                signal_type=SignalType.SELL,
-                                price=current_price,
-                                timestamp=datetime.now(),
-                                strength=1.0,
-                                quantity=pos['quantity'],
-                                metadata={'reason': 'take_profit', 'profit_ratio': profit_ratio}
-                            )
-                            signals.append(signal)
+        symbols, prices, ratios, quantities = columns
+        rows = np.flatnonzero((prices != 0) & (ratios <= -stop_loss_ratio))
+        return self._exit_signals(rows, symbols, prices, ratios, quantities,
+                                  'stop_loss', 'loss_ratio')
+    
+    def apply_take_profit(self, data: pd.DataFrame, take_profit_ratio: float = 0.15) -> List[Signal]:
+        columns = self._position_ratios(data)
+        if columns is None:
+            return []
         
-        return signals
+        symbols, prices, ratios, quantities = columns
+        rows = np.flatnonzero((prices != 0) & (ratios >= take_profit_ratio))
+        return self._exit_signals(rows, symbols, prices, ratios, quantities,
+                                  'take_profit', 'profit_ratio')
     
     def get_strategy_info(self) -> Dict:
         return {
@@ -148,7 +234,8 @@ class BaseStrategy(ABC):
     
     def reset(self):
         self.positions = {}
-        self.signals_history = []
+        self._active = {}
+        self.signals_history = _SignalStore()
     
     def __str__(self) -> str:
         return f"Strategy({self.name}, params={self.params})"
@@ -1,13 +1,12 @@
 """
 交易信号定义
 """
-from enum import Enum
-from dataclasses import dataclass
-from datetime import datetime
+from enum import IntEnum
+import numpy as np
 from typing import Dict, Any, Optional
 
 
-class SignalType(Enum):
+class SignalType(IntEnum):
     BUY = 1
     SELL = 2
     HOLD = 0
@@ -15,26 +14,41 @@ class SignalType(Enum):
     CLOSE_SHORT = 4
 
 
-@dataclass
+_CLOSE_MASK = (1 << SignalType.CLOSE_LONG) | (1 << SignalType.CLOSE_SHORT)
+
+
 class Signal:
-    symbol: str
-    signal_type: SignalType
-    price: float
-    timestamp: datetime
-    strength: float = 1.0
-    quantity: Optional[int] = None
-    metadata: Dict[str, Any] = None
+    __slots__ = ('symbol', 'signal_type', 'price', 'timestamp', 
+                 'strength', 'quantity', 'metadata')
+    
+    def __init__(self, symbol: str, signal_type: SignalType, price: float, 
+                 timestamp: np.datetime64, strength: float = 1.0, 
+                 quantity: Optional[int] = None, metadata: Dict[str, Any] = None):
+        self.symbol = symbol
+        self.signal_type = signal_type
+        self.price = price
+        if timestamp is None:
+            timestamp = 'now'
+        self.timestamp = np.datetime64(timestamp, 'ns')
+        self.strength = strength
+        self.quantity = quantity
+        self.metadata = metadata if metadata is not None else {}
+    
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
     
-    def __post_init__(self):
-        if self.metadata is None:
-            self.metadata = {}
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"Signal({fields})"
     
     def to_dict(self) -> Dict:
         return {
             'symbol': self.symbol,
             'signal_type': self.signal_type.name,
             'price': self.price,
-            'timestamp': self.timestamp.isoformat(),
+            'timestamp': np.datetime_as_string(self.timestamp, unit='ns'),
             'strength': self.strength,
             'quantity': self.quantity,
             'metadata': self.metadata
@@ -46,7 +60,7 @@ class Signal:
             symbol=data['symbol'],
             signal_type=SignalType[data['signal_type']],
             price=data['price'],
-            timestamp=datetime.fromisoformat(data['timestamp']),
+            timestamp=np.datetime64(data['timestamp'], 'ns'),
             strength=data.get('strength', 1.0),
             quantity=data.get('quantity'),
             metadata=data.get('metadata', {})
@@ -62,7 +76,7 @@ class Signal:
         return self.signal_type == SignalType.HOLD
     
     def is_close_position(self) -> bool:
-        return self.signal_type in [SignalType.CLOSE_LONG, SignalType.CLOSE_SHORT]
+        return bool(_CLOSE_MASK >> self.signal_type & 1)
     
     def __str__(self) -> str:
         return f"Signal({self.symbol}, {self.signal_type.name}, price={self.price}, strength={self.strength})"
@@ -3,22 +3,147 @@
 """
 import pandas as pd
 import numpy as np
+from numba import njit
 from typing import Dict, List
-from datetime import datetime
 from ..base.base_strategy import BaseStrategy
 from ..base.signal import Signal, SignalType
 
 
+_CROSS_KINDS = (
+    (SignalType.SELL, 'death_cross'),
+    (SignalType.BUY, 'golden_cross')
+)
+
+
+_NOBS = 0
+_SUM = 1
+_COMP_ADD = 2
+_COMP_REMOVE = 3
+_NEG_CT = 4
+_RUN_LEN = 5
+_PREV = 6
+_STATE_SIZE = 7
+
+
+# Rolling-window state mirroring pandas' roll_mean
+# (Kahan-compensated sum, sign and run-length tracking).
+@njit(cache=True)
+def _window_add(val, state):
+    if val == val:
+        state[_NOBS] += 1
+        y = val - state[_COMP_ADD]
+        t = state[_SUM] + y
+        state[_COMP_ADD] = t - state[_SUM] - y
+        state[_SUM] = t
+        if np.signbit(val):
+            state[_NEG_CT] += 1
+        if val == state[_PREV]:
+            state[_RUN_LEN] += 1
+        else:
+            state[_RUN_LEN] = 1
+        state[_PREV] = val
+
+
+@njit(cache=True)
+def _window_remove(val, state):
+    if val == val:
+        state[_NOBS] -= 1
+        y = -val - state[_COMP_REMOVE]
+        t = state[_SUM] + y
+        state[_COMP_REMOVE] = t - state[_SUM] - y
+        state[_SUM] = t
+        if np.signbit(val):
+            state[_NEG_CT] -= 1
+
+
+@njit(cache=True)
+def _window_mean(state, window):
+    nobs = state[_NOBS]
+    if nobs < window or nobs == 0:
+        return np.nan
+    if state[_RUN_LEN] >= nobs:
+        return state[_PREV]
+    
+    result = state[_SUM] / nobs
+    if state[_NEG_CT] == 0 and result < 0:
+        return 0.0
+    if state[_NEG_CT] == nobs and result > 0:
+        return 0.0
+    return result
+
+
+@njit(cache=True)
+def _ma_core(close, fast_period, slow_period):
+    n = close.shape[0]
+    ma_fast = np.empty(n)
+    ma_slow = np.empty(n)
+    cross_idx = np.empty(n, np.int64)
+    cross_up = np.empty(n, np.bool_)
+    n_cross = 0
+    
+    fast_state = np.zeros(_STATE_SIZE)
+    slow_state = np.zeros(_STATE_SIZE)
+    prev_fast = np.nan
+    prev_slow = np.nan
+    for i in range(n):
+        if i >= fast_period:
+            _window_remove(close[i - fast_period], fast_state)
+        if i >= slow_period:
+            _window_remove(close[i - slow_period], slow_state)
+        _window_add(close[i], fast_state)
+        _window_add(close[i], slow_state)
+        
+        f = _window_mean(fast_state, fast_period)
+        s = _window_mean(slow_state, slow_period)
+        ma_fast[i] = f
+        ma_slow[i] = s
+        
+        if f > s and prev_fast <= prev_slow:
+            cross_idx[n_cross] = i
+            cross_up[n_cross] = True
+            n_cross += 1
+        elif f < s and prev_fast >= prev_slow:
+            cross_idx[n_cross] = i
+            cross_up[n_cross] = False
+            n_cross += 1
+        prev_fast = f
+        prev_slow = s
+    
+    return ma_fast, ma_slow, cross_idx[:n_cross], cross_up[:n_cross]
+
+
+def _ma_core_polars(close, fast_period, slow_period):
+    import polars as pl
+    
+    ma_fast = pl.col('ma_fast')
+    ma_slow = pl.col('ma_slow')
+    golden = (ma_fast > ma_slow) & (ma_fast.shift(1) <= ma_slow.shift(1))
+    death = (ma_fast < ma_slow) & (ma_fast.shift(1) >= ma_slow.shift(1))
+    frame = pl.LazyFrame({'close': close}).with_columns(
+        pl.col('close').fill_nan(None)
+    ).with_columns(
+        pl.col('close').rolling_mean(fast_period).alias('ma_fast'),
+        pl.col('close').rolling_mean(slow_period).alias('ma_slow')
+    ).with_columns(
+        golden.fill_null(False).alias('golden'),
+        death.fill_null(False).alias('death')
+    ).collect()
+    
+    golden = frame['golden'].to_numpy()
+    cross_idx = np.flatnonzero(golden | frame['death'].to_numpy())
+    return frame['ma_fast'].to_numpy(), frame['ma_slow'].to_numpy(), cross_idx, golden[cross_idx]
+
+
 class MAStrategy(BaseStrategy):
     def __init__(self, fast_period: int = 5, slow_period: int = 20, 
-                 stop_loss: float = 0.08, take_profit: float = 0.15):
+                 stop_loss: float = 0.08, take_profit: float = 0.15, backend: str = 'numba'):
         params = {
             'fast_period': fast_period,
             'slow_period': slow_period,
             'stop_loss': stop_loss,
             'take_profit': take_profit
         }
-        super().__init__("MA_Strategy", params)
+        super().__init__("MA_Strategy", params, backend)
     
     def _validate_params(self):
         if self.params['fast_period'] >= self.params['slow_period']:
@@ -33,64 +158,27 @@ class MAStrategy(BaseStrategy):
         fast_period = self.params['fast_period']
         slow_period = self.params['slow_period']
         
-        data = data.copy()
-        data['MA_Fast'] = data['close'].rolling(window=fast_period).mean()
-        data['MA_Slow'] = data['close'].rolling(window=slow_period).mean()
-        
-        data['Golden_Cross'] = (
-            (data['MA_Fast'] > data['MA_Slow']) & 
-            (data['MA_Fast'].shift(1) <= data['MA_Slow'].shift(1))
-        ).astype(int)
+        close = data['close'].to_numpy(dtype=np.float64)
+        timestamps = self._index_timestamps(data.index)
+        core = _ma_core_polars if self.backend == 'polars' else _ma_core
+        ma_fast, ma_slow, cross_idx, cross_up = core(close, fast_period, slow_period)
         
-        data['Death_Cross'] = (
-            (data['MA_Fast'] < data['MA_Slow']) & 
-            (data['MA_Fast'].shift(1) >= data['MA_Slow'].shift(1))
-        ).astype(int)
-        
-        for idx, row in data.iterrows():
-            if pd.isna(row['MA_Fast']) or pd.isna(row['MA_Slow']):
-                continue
-            
-            timestamp = idx if isinstance(idx, datetime) else datetime.now()
+        for i, is_buy in zip(cross_idx, cross_up.tolist()):
+            signal_type, reason = _CROSS_KINDS[is_buy]
             
-            if row['Golden_Cross'] == 1:
-                signal = Signal(
-                    symbol='',
-                    signal_type=SignalType.BUY,
-                    price=row['close'],
-                    timestamp=timestamp,
-                    strength=1.0,
-                    metadata={
-                        'MA_Fast': row['MA_Fast'],
-                        'MA_Slow': row['MA_Slow'],
-                        'reason': 'golden_cross'
-                    }
-                )
-                signals.append(signal)
-                self.record_signal(signal)
-            
-            elif row['Death_Cross'] == 1:
-                signal = Signal(
-                    symbol='',
-                    signal_type=SignalType.SELL,
-                    price=row['close'],
-                    timestamp=timestamp,
-                    strength=1.0,
-                    metadata={
-                        'MA_Fast': row['MA_Fast'],
-                        'MA_Slow': row['MA_Slow'],
-                        'reason': 'death_cross'
-                    }
-                )
-                signals.append(signal)
-                self.record_signal(signal)
-        
-        return signals
-    
-    def generate_signal_for_symbol(self, symbol: str, data: pd.DataFrame) -> List[Signal]:
-        signals = self.generate_signals(data)
-        
-        for signal in signals:
-            signal.symbol = symbol
+            signal = Signal(
+                symbol='',
+                signal_type=signal_type,
+                price=close[i],
+                timestamp=timestamps[i],
+                strength=1.0,
+                metadata={
+                    'MA_Fast': ma_fast[i],
+                    'MA_Slow': ma_slow[i],
+                    'reason': reason
+                }
+            )
+            signals.append(signal)
+            self.record_signal(signal)
         
         return signals
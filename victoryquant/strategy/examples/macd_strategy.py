@@ -3,98 +3,185 @@ MACD策略
 """
 import pandas as pd
 import numpy as np
+from numba import njit, prange
 from typing import Dict, List
-from datetime import datetime
 from ..base.base_strategy import BaseStrategy
 from ..base.signal import Signal, SignalType
 
 
+_CROSS_KINDS = (
+    (SignalType.SELL, 'macd_death_cross'),
+    (SignalType.BUY, 'macd_golden_cross')
+)
+
+
+@njit(cache=True)
+def _ewm_step(weighted, old_wt, cur, alpha):
+    if weighted != weighted:
+        return cur, old_wt
+    old_wt *= 1.0 - alpha
+    if cur == cur:
+        if weighted != cur:
+            weighted = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+        old_wt = 1.0
+    return weighted, old_wt
+
+
+@njit(cache=True)
+def _macd_core(close, alpha_fast, alpha_slow, alpha_signal):
+    n = close.shape[0]
+    macd = np.empty(n)
+    macd_signal = np.empty(n)
+    macd_hist = np.empty(n)
+    cross_idx = np.empty(n, np.int64)
+    cross_up = np.empty(n, np.bool_)
+    n_cross = 0
+    
+    ema_fast = np.nan
+    ema_slow = np.nan
+    sig = np.nan
+    wt_fast = 1.0
+    wt_slow = 1.0
+    wt_sig = 1.0
+    prev = np.nan
+    for i in range(n):
+        ema_fast, wt_fast = _ewm_step(ema_fast, wt_fast, close[i], alpha_fast)
+        ema_slow, wt_slow = _ewm_step(ema_slow, wt_slow, close[i], alpha_slow)
+        m = ema_fast - ema_slow
+        sig, wt_sig = _ewm_step(sig, wt_sig, m, alpha_signal)
+        
+        d = m - sig
+        macd[i] = m
+        macd_signal[i] = sig
+        macd_hist[i] = d
+        
+        if d > 0 and prev <= 0:
+            cross_idx[n_cross] = i
+            cross_up[n_cross] = True
+            n_cross += 1
+        elif d < 0 and prev >= 0:
+            cross_idx[n_cross] = i
+            cross_up[n_cross] = False
+            n_cross += 1
+        prev = d
+    
+    return macd, macd_signal, macd_hist, cross_idx[:n_cross], cross_up[:n_cross]
+
+
+@njit(parallel=True, cache=True)
+def _macd_multi(closes, alpha_fast, alpha_slow, alpha_signal):
+    n_symbols, n_bars = closes.shape
+    macd = np.empty((n_symbols, n_bars))
+    macd_signal = np.empty((n_symbols, n_bars))
+    macd_hist = np.empty((n_symbols, n_bars))
+    crosses = np.zeros((n_symbols, n_bars), np.int8)
+    for s in prange(n_symbols):
+        row_macd, row_signal, row_hist, cross_idx, cross_up = _macd_core(
+            closes[s], alpha_fast, alpha_slow, alpha_signal
+        )
+        macd[s] = row_macd
+        macd_signal[s] = row_signal
+        macd_hist[s] = row_hist
+        for k in range(cross_idx.shape[0]):
+            crosses[s, cross_idx[k]] = 1 if cross_up[k] else -1
+    return macd, macd_signal, macd_hist, crosses
+
+
+def _macd_core_polars(close, alpha_fast, alpha_slow, alpha_signal):
+    import polars as pl
+    
+    ewm = {'adjust': False, 'ignore_nulls': False}
+    close_col = pl.col('close')
+    hist = pl.col('macd_hist')
+    frame = pl.LazyFrame({'close': close}).with_columns(
+        close_col.fill_nan(None)
+    ).with_columns(
+        (close_col.ewm_mean(alpha=alpha_fast, **ewm).forward_fill()
+         - close_col.ewm_mean(alpha=alpha_slow, **ewm).forward_fill()).alias('macd')
+    ).with_columns(
+        pl.col('macd').ewm_mean(alpha=alpha_signal, **ewm).forward_fill().alias('macd_signal')
+    ).with_columns(
+        (pl.col('macd') - pl.col('macd_signal')).alias('macd_hist')
+    ).with_columns(
+        ((hist > 0) & (hist.shift(1) <= 0)).fill_null(False).alias('golden'),
+        ((hist < 0) & (hist.shift(1) >= 0)).fill_null(False).alias('death')
+    ).collect()
+    
+    golden = frame['golden'].to_numpy()
+    cross_idx = np.flatnonzero(golden | frame['death'].to_numpy())
+    return (frame['macd'].to_numpy(), frame['macd_signal'].to_numpy(),
+            frame['macd_hist'].to_numpy(), cross_idx, golden[cross_idx])
+
+
 class MACDStrategy(BaseStrategy):
     def __init__(self, fast_period: int = 12, slow_period: int = 26, 
-                 signal_period: int = 9, stop_loss: float = 0.08):
+                 signal_period: int = 9, stop_loss: float = 0.08, backend: str = 'numba'):
         params = {
             'fast_period': fast_period,
             'slow_period': slow_period,
             'signal_period': signal_period,
             'stop_loss': stop_loss
         }
-        super().__init__("MACD_Strategy", params)
+        super().__init__("MACD_Strategy", params, backend)
+    
+    def _alphas(self):
+        return (2.0 / (self.params['fast_period'] + 1), 2.0 / (self.params['slow_period'] + 1),
+                2.0 / (self.params['signal_period'] + 1))
     
     def generate_signals(self, data: pd.DataFrame) -> List[Signal]:
-        signals = []
-        
         if data.empty:
-            return signals
-        
-        fast_period = self.params['fast_period']
-        slow_period = self.params['slow_period']
-        signal_period = self.params['signal_period']
-        
-        data = data.copy()
-        
-        ema_fast = data['close'].ewm(span=fast_period, adjust=False).mean()
-        ema_slow = data['close'].ewm(span=slow_period, adjust=False).mean()
-        
-        data['MACD'] = ema_fast - ema_slow
-        data['MACD_Signal'] = data['MACD'].ewm(span=signal_period, adjust=False).mean()
-        data['MACD_Hist'] = data['MACD'] - data['MACD_Signal']
+            return []
         
-        data['Golden_Cross'] = (
-            (data['MACD'] > data['MACD_Signal']) & 
-            (data['MACD'].shift(1) <= data['MACD_Signal'].shift(1))
-        ).astype(int)
+        close = data['close'].to_numpy(dtype=np.float64)
+        timestamps = self._index_timestamps(data.index)
         
-        data['Death_Cross'] = (
-            (data['MACD'] < data['MACD_Signal']) & 
-            (data['MACD'].shift(1) >= data['MACD_Signal'].shift(1))
-        ).astype(int)
+        core = _macd_core_polars if self.backend == 'polars' else _macd_core
+        macd, macd_signal, macd_hist, cross_idx, cross_up = core(close, *self._alphas())
+        return self._emit_signals('', close, timestamps, macd, macd_signal, macd_hist,
+                                  cross_idx, cross_up)
+    
+    def generate_signals_multi(self, data_dict: Dict[str, pd.DataFrame]) -> Dict[str, List[Signal]]:
+        if self.backend == 'polars':
+            return {symbol: self.generate_signal_for_symbol(symbol, data)
+                    for symbol, data in data_dict.items()}
         
-        for idx, row in data.iterrows():
-            if pd.isna(row['MACD']) or pd.isna(row['MACD_Signal']):
-                continue
-            
-            timestamp = idx if isinstance(idx, datetime) else datetime.now()
-            
-            if row['Golden_Cross'] == 1:
-                signal = Signal(
-                    symbol='',
-                    signal_type=SignalType.BUY,
-                    price=row['close'],
-                    timestamp=timestamp,
-                    strength=abs(row['MACD_Hist']),
-                    metadata={
-                        'MACD': row['MACD'],
-                        'MACD_Signal': row['MACD_Signal'],
-                        'MACD_Hist': row['MACD_Hist'],
-                        'reason': 'macd_golden_cross'
-                    }
-                )
-                signals.append(signal)
-                self.record_signal(signal)
-            
-            elif row['Death_Cross'] == 1:
-                signal = Signal(
-                    symbol='',
-                    signal_type=SignalType.SELL,
-                    price=row['close'],
-                    timestamp=timestamp,
-                    strength=abs(row['MACD_Hist']),
-                    metadata={
-                        'MACD': row['MACD'],
-                        'MACD_Signal': row['MACD_Signal'],
-                        'MACD_Hist': row['MACD_Hist'],
-                        'reason': 'macd_death_cross'
-                    }
-                )
-                signals.append(signal)
-                self.record_signal(signal)
+        symbols, closes, lengths = self._stack_closes(data_dict)
+        macd, macd_signal, macd_hist, crosses = _macd_multi(closes, *self._alphas())
         
-        return signals
+        result = {}
+        for row, (symbol, n) in enumerate(zip(symbols, lengths)):
+            flags = crosses[row, :n]
+            cross_idx = np.flatnonzero(flags)
+            result[symbol] = self._emit_signals(
+                symbol, closes[row, :n], self._index_timestamps(data_dict[symbol].index),
+                macd[row, :n], macd_signal[row, :n], macd_hist[row, :n],
+                cross_idx, flags[cross_idx] > 0
+            )
+        return result
     
-    def generate_signal_for_symbol(self, symbol: str, data: pd.DataFrame) -> List[Signal]:
-        signals = self.generate_signals(data)
+    def _emit_signals(self, symbol: str, close: np.ndarray, timestamps: np.ndarray,
+                      macd: np.ndarray, macd_signal: np.ndarray, macd_hist: np.ndarray,
+                      cross_idx: np.ndarray, cross_up: np.ndarray) -> List[Signal]:
+        signals = []
+        strengths = np.abs(macd_hist[cross_idx])
         
-        for signal in signals:
-            signal.symbol = symbol
+        for i, is_buy, strength in zip(cross_idx, cross_up.tolist(), strengths):
+            signal_type, reason = _CROSS_KINDS[is_buy]
+            
+            signal = Signal(
+                symbol=symbol,
+                signal_type=signal_type,
+                price=close[i],
+                timestamp=timestamps[i],
+                strength=strength,
+                metadata={
+                    'MACD': macd[i],
+                    'MACD_Signal': macd_signal[i],
+                    'MACD_Hist': macd_hist[i],
+                    'reason': reason
+                }
+            )
+            signals.append(signal)
+            self.record_signal(signal)
         
         return signals
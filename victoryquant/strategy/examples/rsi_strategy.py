@@ -3,111 +3,188 @@ RSI策略
 """
 import pandas as pd
 import numpy as np
+from numba import njit, prange
 from typing import Dict, List
-from datetime import datetime
 from ..base.base_strategy import BaseStrategy
 from ..base.signal import Signal, SignalType
+from .ma_strategy import _STATE_SIZE, _window_add, _window_mean, _window_remove
+
+
+@njit(cache=True)
+def _rsi_core(close, period, oversold, overbought):
+    n = close.shape[0]
+    rsi = np.full(n, np.nan)
+    gains = np.zeros(n)
+    losses = np.zeros(n)
+    buy_idx = np.empty(n, np.int64)
+    sell_idx = np.empty(n, np.int64)
+    n_buy = 0
+    n_sell = 0
+    
+    gain_state = np.zeros(_STATE_SIZE)
+    loss_state = np.zeros(_STATE_SIZE)
+    prev = np.nan
+    for i in range(n):
+        if i > 0:
+            d = close[i] - close[i - 1]
+            gains[i] = d if d > 0 else 0.0
+            losses[i] = -d if d < 0 else -0.0
+        if i >= period:
+            _window_remove(gains[i - period], gain_state)
+            _window_remove(losses[i - period], loss_state)
+        _window_add(gains[i], gain_state)
+        _window_add(losses[i], loss_state)
+        
+        avg_gain = _window_mean(gain_state, period)
+        avg_loss = _window_mean(loss_state, period)
+        if avg_loss != 0:
+            denom = 1.0 + avg_gain / avg_loss
+            cur = 100.0 - 100.0 / denom if denom != 0 else np.nan
+        elif avg_gain > 0:
+            cur = 100.0
+        else:
+            cur = np.nan
+        rsi[i] = cur
+        
+        if cur > oversold and prev <= oversold:
+            buy_idx[n_buy] = i
+            n_buy += 1
+        elif cur < overbought and prev >= overbought:
+            sell_idx[n_sell] = i
+            n_sell += 1
+        prev = cur
+    
+    return rsi, buy_idx[:n_buy], sell_idx[:n_sell]
+
+
+@njit(parallel=True, cache=True)
+def _rsi_multi(closes, period, oversold, overbought):
+    n_symbols, n_bars = closes.shape
+    rsi = np.empty((n_symbols, n_bars))
+    crosses = np.zeros((n_symbols, n_bars), np.int8)
+    for s in prange(n_symbols):
+        row_rsi, buy_idx, sell_idx = _rsi_core(closes[s], period, oversold, overbought)
+        rsi[s] = row_rsi
+        for i in buy_idx:
+            crosses[s, i] = 1
+        for i in sell_idx:
+            crosses[s, i] = -1
+    return rsi, crosses
+
+
+def _rsi_core_polars(close, period, oversold, overbought):
+    import polars as pl
+    
+    delta = pl.col('close').diff()
+    rsi = pl.col('rsi')
+    frame = pl.LazyFrame({'close': close}).with_columns(
+        pl.col('close').fill_nan(None)
+    ).with_columns(
+        pl.when(delta > 0).then(delta).otherwise(0.0).rolling_mean(period).alias('gain'),
+        pl.when(delta < 0).then(-delta).otherwise(0.0).rolling_mean(period).alias('loss')
+    ).with_columns(
+        (100.0 - 100.0 / (1.0 + pl.col('gain') / pl.col('loss'))).fill_nan(None).alias('rsi')
+    ).with_columns(
+        ((rsi > oversold) & (rsi.shift(1) <= oversold)).fill_null(False).alias('buy'),
+        ((rsi < overbought) & (rsi.shift(1) >= overbought)).fill_null(False).alias('sell')
+    ).collect()
+    
+    return (frame['rsi'].to_numpy(), np.flatnonzero(frame['buy'].to_numpy()),
+            np.flatnonzero(frame['sell'].to_numpy()))
 
 
 class RSIStrategy(BaseStrategy):
     def __init__(self, period: int = 14, oversold: float = 30, 
-                 overbought: float = 70, stop_loss: float = 0.08):
+                 overbought: float = 70, stop_loss: float = 0.08, backend: str = 'numba'):
         params = {
             'period': period,
             'oversold': oversold,
             'overbought': overbought,
             'stop_loss': stop_loss
         }
-        super().__init__("RSI_Strategy", params)
+        super().__init__("RSI_Strategy", params, backend)
     
     def _validate_params(self):
         if self.params['oversold'] >= self.params['overbought']:
             raise ValueError("超卖阈值必须小于超买阈值")
     
     def generate_signals(self, data: pd.DataFrame) -> List[Signal]:
-        signals = []
-        
         if data.empty:
-            return signals
+            return []
         
         period = self.params['period']
         oversold = self.params['oversold']
         overbought = self.params['overbought']
         
-        data = data.copy()
-        
-        delta = data['close'].diff()
-        gain = (delta.where(delta > 0, 0)).fillna(0)
-        loss = (-delta.where(delta < 0, 0)).fillna(0)
+        close = data['close'].to_numpy(dtype=np.float64)
+        timestamps = self._index_timestamps(data.index)
         
-        avg_gain = gain.rolling(window=period).mean()
-        avg_loss = loss.rolling(window=period).mean()
+        core = _rsi_core_polars if self.backend == 'polars' else _rsi_core
+        rsi, buy_idx, sell_idx = core(close, period, float(oversold), float(overbought))
+        return self._emit_signals('', close, timestamps, rsi, buy_idx, sell_idx)
+    
+    def generate_signals_multi(self, data_dict: Dict[str, pd.DataFrame]) -> Dict[str, List[Signal]]:
+        if self.backend == 'polars':
+            return {symbol: self.generate_signal_for_symbol(symbol, data)
+                    for symbol, data in data_dict.items()}
         
-        rs = avg_gain / avg_loss
-        data['RSI'] = 100 - (100 / (1 + rs))
+        symbols, closes, lengths = self._stack_closes(data_dict)
+        rsi, crosses = _rsi_multi(closes, self.params['period'], 
+                                  float(self.params['oversold']), float(self.params['overbought']))
         
-        data['Oversold_Signal'] = (
-            (data['RSI'] < oversold) & 
-            (data['RSI'].shift(1) >= oversold)
-        ).astype(int)
+        result = {}
+        for row, (symbol, n) in enumerate(zip(symbols, lengths)):
+            flags = crosses[row, :n]
+            result[symbol] = self._emit_signals(
+                symbol, closes[row, :n], self._index_timestamps(data_dict[symbol].index),
+                rsi[row, :n], np.flatnonzero(flags == 1), np.flatnonzero(flags == -1)
+            )
+        return result
+    
+    def _emit_signals(self, symbol: str, close: np.ndarray, timestamps: np.ndarray, rsi: np.ndarray,
+                      buy_idx: np.ndarray, sell_idx: np.ndarray) -> List[Signal]:
+        signals = []
+        oversold = self.params['oversold']
+        overbought = self.params['overbought']
         
-        data['Overbought_Signal'] = (
-            (data['RSI'] > overbought) & 
-            (data['RSI'].shift(1) <= overbought)
-        ).astype(int)
+        prev_rsi = np.concatenate(([np.nan], rsi[:-1]))
         
-        data['Rising_From_Oversold'] = (
-            (data['RSI'] > oversold) & 
-            (data['RSI'].shift(1) <= oversold)
-        ).astype(int)
+        prev_buy = prev_rsi[buy_idx]
+        prev_sell = prev_rsi[sell_idx]
+        buy_strength = np.where(np.isnan(prev_buy), 0.5, (oversold - prev_buy) / oversold)
+        sell_strength = np.where(np.isnan(prev_sell), 0.5, 
+                                 (prev_sell - overbought) / (100 - overbought))
         
-        data['Falling_From_Overbought'] = (
-            (data['RSI'] < overbought) & 
-            (data['RSI'].shift(1) >= overbought)
-        ).astype(int)
+        cross_idx = np.concatenate((buy_idx, sell_idx))
+        strengths = np.concatenate((buy_strength, sell_strength))
+        order = np.argsort(cross_idx, kind='stable')
         
-        for idx, row in data.iterrows():
-            if pd.isna(row['RSI']):
-                continue
-            
-            timestamp = idx if isinstance(idx, datetime) else datetime.now()
-            
-            if row['Rising_From_Oversold'] == 1:
+        for i, is_buy, strength in zip(cross_idx[order], order < len(buy_idx), strengths[order]):
+            if is_buy:
                 signal = Signal(
-                    symbol='',
+                    symbol=symbol,
                     signal_type=SignalType.BUY,
-                    price=row['close'],
-                    timestamp=timestamp,
-                    strength=(oversold - row['RSI'].shift(1)) / oversold if not pd.isna(row['RSI'].shift(1)) else 0.5,
+                    price=close[i],
+                    timestamp=timestamps[i],
+                    strength=strength,
                     metadata={
-                        'RSI': row['RSI'],
+                        'RSI': rsi[i],
                         'reason': 'rising_from_oversold'
                     }
                 )
-                signals.append(signal)
-                self.record_signal(signal)
-            
-            elif row['Falling_From_Overbought'] == 1:
+            else:
                 signal = Signal(
-                    symbol='',
+                    symbol=symbol,
                     signal_type=SignalType.SELL,
-                    price=row['close'],
-                    timestamp=timestamp,
-                    strength=(row['RSI'].shift(1) - overbought) / (100 - overbought) if not pd.isna(row['RSI'].shift(1)) else 0.5,
+                    price=close[i],
+                    timestamp=timestamps[i],
+                    strength=strength,
                     metadata={
-                        'RSI': row['RSI'],
+                        'RSI': rsi[i],
                         'reason': 'falling_from_overbought'
                     }
                 )
-                signals.append(signal)
-                self.record_signal(signal)
-        
-        return signals
-    
-    def generate_signal_for_symbol(self, symbol: str, data: pd.DataFrame) -> List[Signal]:
-        signals = self.generate_signals(data)
-        
-        for signal in signals:
-            signal.symbol = symbol
+            signals.append(signal)
+            self.record_signal(signal)
         
         return signals
@@ -1,7 +1,7 @@
 """
 交易执行模块
 """
-from .order_manager import OrderManager
-from .broker_interface import BrokerInterface
+from .order import OrderManager
+from .broker import BrokerInterface, SimulatedBroker
 
-__all__ = ['OrderManager', 'BrokerInterface']
+__all__ = ['OrderManager', 'BrokerInterface', 'SimulatedBroker']
@@ -0,0 +1,6 @@
+"""
+券商接口模块
+"""
+from .broker_interface import BrokerInterface, SimulatedBroker
+
+__all__ = ['BrokerInterface', 'SimulatedBroker']
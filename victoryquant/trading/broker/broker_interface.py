@@ -4,11 +4,27 @@
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional
 from datetime import datetime
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import numpy as np
 
-from order.order import Order, OrderStatus, OrderType, OrderDirection
+from ..order.order import Order, OrderStatus, OrderType, OrderDirection
+from ...utils.columnar import GrowableArray
+
+
+_TRADE_DTYPE = np.dtype([
+    ('order_id', object),
+    ('symbol', object),
+    ('direction', np.int8),
+    ('price', np.float64),
+    ('quantity', np.int64),
+    ('amount', np.float64),
+    ('commission', np.float64),
+    ('profit', np.float64),
+    ('timestamp', 'datetime64[ns]')
+])
+_TRADE_BUY = 1
+_TRADE_SELL = 2
+_TRADE_DIRECTIONS = ('', 'BUY', 'SELL')
+_TRADE_CAPACITY = 4096
 
 
 class BrokerInterface(ABC):
@@ -67,8 +83,10 @@ class SimulatedBroker(BrokerInterface):
         self.initial_capital = initial_capital
         self.cash = initial_capital
         self.positions = {}
+        self._active = {}
+        self._position_value = 0.0
         self.orders = {}
-        self.trades = []
+        self._trades = GrowableArray(_TRADE_DTYPE, _TRADE_CAPACITY)
         self.commission_rate = 0.0003
         self.stamp_duty_rate = 0.001
         self.slippage = 0.001
@@ -107,13 +125,10 @@ class SimulatedBroker(BrokerInterface):
         return OrderStatus.REJECTED
     
     def get_positions(self) -> Dict:
-        return {k: v for k, v in self.positions.items() if v['quantity'] > 0}
+        return {symbol: self.positions[symbol] for symbol in self._active}
     
     def get_account_info(self) -> Dict:
-        position_value = sum(
-            pos['quantity'] * pos.get('current_price', pos['avg_cost'])
-            for pos in self.positions.values()
-        )
+        position_value = self._position_value
         
         return {
             'total_value': self.cash + position_value,
@@ -128,8 +143,35 @@ class SimulatedBroker(BrokerInterface):
             'available': self.cash
         }
     
+    @property
+    def trades(self) -> np.ndarray:
+        return self._trades.values
+    
     def get_today_trades(self) -> List[Dict]:
-        return self.trades
+        trades = self.trades
+        timestamps = np.datetime_as_string(trades['timestamp'], unit='us')
+        result = []
+        for row, timestamp in zip(trades.tolist(), timestamps):
+            order_id, symbol, direction, price, quantity, amount, commission, profit, _ = row
+            trade = {
+                'order_id': order_id,
+                'symbol': symbol,
+                'direction': _TRADE_DIRECTIONS[direction],
+                'price': price,
+                'quantity': quantity,
+                'amount': amount,
+                'commission': commission,
+                'timestamp': str(timestamp)
+            }
+            if direction == _TRADE_SELL:
+                trade['profit'] = profit
+            result.append(trade)
+        return result
+    
+    def _append_trade(self, order_id: str, symbol: str, direction: int, price: float, quantity: int,
+                      amount: float, commission: float, profit: float, timestamp: np.datetime64):
+        self._trades.append((order_id, symbol, direction, price, quantity,
+                             amount, commission, profit, timestamp))
     
     def get_today_orders(self) -> List[Dict]:
         return [order.to_dict() for order in self.orders.values()]
@@ -143,6 +185,45 @@ class SimulatedBroker(BrokerInterface):
         else:
             return self._execute_sell(order, current_price)
     
+    def execute_orders(self, orders: List[Order], current_prices) -> np.ndarray:
+        filled = np.zeros(len(orders), dtype=bool)
+        if not self.connected or not orders:
+            return filled
+        
+        n = len(orders)
+        current_prices = np.asarray(current_prices, dtype=np.float64)
+        directions = np.fromiter((o.direction for o in orders), dtype=np.int8, count=n)
+        order_types = np.fromiter((o.order_type for o in orders), dtype=np.int8, count=n)
+        is_buy = directions == OrderDirection.BUY
+        is_market = order_types == OrderType.MARKET
+        is_limit = order_types == OrderType.LIMIT
+        quantities = np.fromiter((o.quantity for o in orders), dtype=np.float64, count=n)
+        limit_prices = np.fromiter(
+            (o.price if o.price is not None else np.nan for o in orders), dtype=np.float64, count=n
+        )
+        
+        market_prices = np.where(is_buy, current_prices * (1 + self.slippage),
+                                 current_prices * (1 - self.slippage))
+        limit_ok = np.where(is_buy, limit_prices >= current_prices, limit_prices <= current_prices)
+        executable = is_market | (is_limit & limit_ok)
+        execution_prices = np.where(is_market, market_prices, limit_prices)
+        
+        amounts = quantities * execution_prices
+        commissions = np.maximum(amounts * self.commission_rate, 5)
+        stamp_duties = np.where(is_buy, 0.0, amounts * self.stamp_duty_rate)
+        timestamp = np.datetime64(datetime.now(), 'ns')
+        
+        for i, order in enumerate(orders):
+            if is_buy[i]:
+                if executable[i]:
+                    filled[i] = self._fill_buy(order, execution_prices[i], amounts[i],
+                                               commissions[i], timestamp)
+            elif self._has_sellable(order) and executable[i]:
+                filled[i] = self._fill_sell(order, execution_prices[i], amounts[i],
+                                            commissions[i], stamp_duties[i], timestamp)
+        
+        return filled
+    
     def _execute_buy(self, order: Order, current_price: float) -> bool:
         if order.order_type == OrderType.MARKET:
             execution_price = current_price * (1 + self.slippage)
@@ -153,9 +234,14 @@ class SimulatedBroker(BrokerInterface):
         else:
             return False
         
-        quantity = order.quantity
-        amount = quantity * execution_price
+        amount = order.quantity * execution_price
         commission = max(amount * self.commission_rate, 5)
+        return self._fill_buy(order, execution_price, amount, commission,
+                              np.datetime64(datetime.now(), 'ns'))
+    
+    def _fill_buy(self, order: Order, execution_price: float, amount: float,
+                  commission: float, timestamp: np.datetime64) -> bool:
+        quantity = order.quantity
         total_cost = amount + commission
         
         if total_cost > self.cash:
@@ -173,31 +259,30 @@ class SimulatedBroker(BrokerInterface):
             }
         
         pos = self.positions[symbol]
+        self._position_value -= self._market_value(pos)
         pos['total_cost'] += amount
         pos['quantity'] += quantity
         pos['avg_cost'] = pos['total_cost'] / pos['quantity']
+        self._position_value += self._market_value(pos)
+        self._active[symbol] = None
         
         order.update_fill(quantity, execution_price, commission)
         
-        self.trades.append({
-            'order_id': order.order_id,
-            'symbol': symbol,
-            'direction': 'BUY',
-            'price': execution_price,
-            'quantity': quantity,
-            'amount': amount,
-            'commission': commission,
-            'timestamp': datetime.now().isoformat()
-        })
+        self._append_trade(order.order_id, symbol, _TRADE_BUY, execution_price, quantity,
+                           amount, commission, np.nan, timestamp)
         
         return True
     
-    def _execute_sell(self, order: Order, current_price: float) -> bool:
-        symbol = order.symbol
-        
-        if symbol not in self.positions or self.positions[symbol]['quantity'] < order.quantity:
+    def _has_sellable(self, order: Order) -> bool:
+        pos = self.positions.get(order.symbol)
+        if pos is None or pos['quantity'] < order.quantity:
             order.reject("持仓不足")
             return False
+        return True
+    
+    def _execute_sell(self, order: Order, current_price: float) -> bool:
+        if not self._has_sellable(order):
+            return False
         
         if order.order_type == OrderType.MARKET:
             execution_price = current_price * (1 - self.slippage)
@@ -208,10 +293,16 @@ class SimulatedBroker(BrokerInterface):
         else:
             return False
         
-        quantity = order.quantity
-        amount = quantity * execution_price
+        amount = order.quantity * execution_price
         commission = max(amount * self.commission_rate, 5)
         stamp_duty = amount * self.stamp_duty_rate
+        return self._fill_sell(order, execution_price, amount, commission, stamp_duty,
+                               np.datetime64(datetime.now(), 'ns'))
+    
+    def _fill_sell(self, order: Order, execution_price: float, amount: float,
+                   commission: float, stamp_duty: float, timestamp: np.datetime64) -> bool:
+        symbol = order.symbol
+        quantity = order.quantity
         
         total_revenue = amount - commission - stamp_duty
         
@@ -221,36 +312,41 @@ class SimulatedBroker(BrokerInterface):
         cost = quantity * pos['avg_cost']
         profit = amount - cost
         
+        self._position_value -= self._market_value(pos)
         pos['quantity'] -= quantity
         if pos['quantity'] <= 0:
             pos['quantity'] = 0
             pos['total_cost'] = 0
             pos['avg_cost'] = 0
+            self._active.pop(symbol, None)
         else:
             pos['total_cost'] = pos['quantity'] * pos['avg_cost']
+        self._position_value += self._market_value(pos)
+        if not self._active:
+            self._position_value = 0.0
         
         order.update_fill(quantity, execution_price, commission + stamp_duty)
         
-        self.trades.append({
-            'order_id': order.order_id,
-            'symbol': symbol,
-            'direction': 'SELL',
-            'price': execution_price,
-            'quantity': quantity,
-            'amount': amount,
-            'commission': commission + stamp_duty,
-            'profit': profit,
-            'timestamp': datetime.now().isoformat()
-        })
+        self._append_trade(order.order_id, symbol, _TRADE_SELL, execution_price, quantity,
+                           amount, commission + stamp_duty, profit, timestamp)
         
         return True
     
+    @staticmethod
+    def _market_value(pos: Dict) -> float:
+        return pos['quantity'] * pos.get('current_price', pos['avg_cost'])
+    
     def update_position_price(self, symbol: str, current_price: float):
-        if symbol in self.positions:
-            self.positions[symbol]['current_price'] = current_price
+        pos = self.positions.get(symbol)
+        if pos is not None:
+            previous_price = pos.get('current_price', pos['avg_cost'])
+            self._position_value += pos['quantity'] * (current_price - previous_price)
+            pos['current_price'] = current_price
     
     def reset(self):
         self.cash = self.initial_capital
         self.positions = {}
+        self._active = {}
+        self._position_value = 0.0
         self.orders = {}
-        self.trades = []
+        self._trades = GrowableArray(_TRADE_DTYPE, _TRADE_CAPACITY)
@@ -1,6 +1,7 @@
 """
 订单管理模块
 """
-from .order import Order, OrderStatus, OrderType
+from .order import Order, OrderStatus, OrderType, OrderDirection
+from .order_manager import OrderManager
 
-__all__ = ['Order', 'OrderStatus', 'OrderType', 'OrderManager']
+__all__ = ['Order', 'OrderStatus', 'OrderType', 'OrderDirection', 'OrderManager']
@@ -1,64 +1,101 @@
 """
 订单定义
 """
-from enum import Enum
-from dataclasses import dataclass
+from enum import IntEnum
 from datetime import datetime
+import itertools
+import os
+import time
 from typing import Dict, Any, Optional
 
 
-class OrderStatus(Enum):
-    PENDING = "pending"
-    SUBMITTED = "submitted"
-    PARTIAL_FILLED = "partial_filled"
-    FILLED = "filled"
-    CANCELLED = "cancelled"
-    REJECTED = "rejected"
+class OrderStatus(IntEnum):
+    PENDING = 0
+    SUBMITTED = 1
+    PARTIAL_FILLED = 2
+    FILLED = 3
+    CANCELLED = 4
+    REJECTED = 5
 
 
-class OrderType(Enum):
-    MARKET = "market"
-    LIMIT = "limit"
-    STOP = "stop"
-    STOP_LIMIT = "stop_limit"
+class OrderType(IntEnum):
+    MARKET = 0
+    LIMIT = 1
+    STOP = 2
+    STOP_LIMIT = 3
 
 
-class OrderDirection(Enum):
-    BUY = "buy"
-    SELL = "sell"
+class OrderDirection(IntEnum):
+    BUY = 0
+    SELL = 1
+
+
+_STATUS_STR = tuple(status.name.lower() for status in OrderStatus)
+_ORDER_TYPE_STR = tuple(order_type.name.lower() for order_type in OrderType)
+_DIRECTION_STR = tuple(direction.name.lower() for direction in OrderDirection)
+_STATUS_BY_STR = {text: OrderStatus(code) for code, text in enumerate(_STATUS_STR)}
+_ORDER_TYPE_BY_STR = {text: OrderType(code) for code, text in enumerate(_ORDER_TYPE_STR)}
+_DIRECTION_BY_STR = {text: OrderDirection(code) for code, text in enumerate(_DIRECTION_STR)}
+_ORDER_PREFIX = f"{time.time_ns() // 1000:x}-{os.getpid():x}"
+_ORDER_SEQ = itertools.count(1)
+_ACTIVE_MASK = ((1 << OrderStatus.PENDING) | (1 << OrderStatus.SUBMITTED)
+                | (1 << OrderStatus.PARTIAL_FILLED))
 
 
-@dataclass
 class Order:
-    symbol: str
-    direction: OrderDirection
-    quantity: int
-    order_type: OrderType
-    price: Optional[float] = None
-    stop_price: Optional[float] = None
-    status: OrderStatus = OrderStatus.PENDING
-    filled_quantity: int = 0
-    filled_price: float = 0.0
-    commission: float = 0.0
-    order_id: Optional[str] = None
-    strategy_id: Optional[str] = None
-    create_time: datetime = None
-    update_time: datetime = None
-    message: str = ""
-    metadata: Dict[str, Any] = None
-    
-    def __post_init__(self):
-        if self.create_time is None:
-            self.create_time = datetime.now()
-        if self.update_time is None:
-            self.update_time = datetime.now()
-        if self.metadata is None:
-            self.metadata = {}
-        if self.order_id is None:
+    _FIELDS = ('symbol', 'direction', 'quantity', 'order_type', 'price', 'stop_price', 'status',
+               'filled_quantity', 'filled_price', 'commission', 'order_id', 'strategy_id',
+               'create_time', 'update_time', 'message', 'metadata')
+    __slots__ = ('symbol', 'direction', 'order_type', 'price', 'stop_price', 'order_id',
+                 'strategy_id', 'message', 'metadata', '_quantity', '_status', '_filled_quantity',
+                 '_filled_price', '_commission', '_create_time', '_update_time', '_notional',
+                 '_tracker')
+    
+    def __init__(self, symbol: str, direction: OrderDirection, quantity: int, order_type: OrderType,
+                 price: Optional[float] = None, stop_price: Optional[float] = None,
+                 status: OrderStatus = OrderStatus.PENDING, filled_quantity: int = 0,
+                 filled_price: float = 0.0, commission: float = 0.0, order_id: Optional[str] = None,
+                 strategy_id: Optional[str] = None, create_time: datetime = None,
+                 update_time: datetime = None, message: str = "", metadata: Dict[str, Any] = None):
+        self._tracker = None
+        self.symbol = symbol
+        self.direction = direction
+        self._quantity = quantity
+        self.order_type = order_type
+        self.price = price
+        self.stop_price = stop_price
+        self._status = status
+        self._filled_quantity = filled_quantity
+        self._notional = filled_price * filled_quantity
+        self._filled_price = filled_price
+        self._commission = commission
+        self.order_id = order_id
+        self.strategy_id = strategy_id
+        if create_time is None or update_time is None:
+            now = datetime.now()
+            create_time = now if create_time is None else create_time
+            update_time = now if update_time is None else update_time
+        self.create_time = create_time
+        self.update_time = update_time
+        self.message = message
+        self.metadata = {} if metadata is None else metadata
+        if order_id is None:
             self.order_id = self._generate_order_id()
     
     def _generate_order_id(self) -> str:
-        return f"{self.symbol}_{self.direction.value}_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+        direction = _DIRECTION_STR[self.direction]
+        return f"{self.symbol}_{direction}_{_ORDER_PREFIX}_{next(_ORDER_SEQ):016x}"
+    
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self._FIELDS)
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self._FIELDS)
+        return f"Order({fields})"
     
     def is_buy(self) -> bool:
         return self.direction == OrderDirection.BUY
@@ -67,7 +104,7 @@ class Order:
         return self.direction == OrderDirection.SELL
     
     def is_active(self) -> bool:
-        return self.status in [OrderStatus.PENDING, OrderStatus.SUBMITTED, OrderStatus.PARTIAL_FILLED]
+        return bool(_ACTIVE_MASK >> self.status & 1)
     
     def is_completed(self) -> bool:
         return self.status == OrderStatus.FILLED
@@ -79,22 +116,97 @@ class Order:
         return self.status == OrderStatus.REJECTED
     
     def get_unfilled_quantity(self) -> int:
-        return self.quantity - self.filled_quantity
+        return self._quantity - self._filled_quantity
+    
+    def _touch(self):
+        if self._tracker is not None:
+            self._tracker.add(self.order_id)
+    
+    @property
+    def quantity(self) -> int:
+        return self._quantity
+    
+    @quantity.setter
+    def quantity(self, value: int):
+        self._quantity = value
+        self._touch()
+    
+    @property
+    def status(self) -> OrderStatus:
+        return self._status
+    
+    @status.setter
+    def status(self, value: OrderStatus):
+        self._status = value
+        self._touch()
+    
+    @property
+    def filled_quantity(self) -> int:
+        return self._filled_quantity
+    
+    @filled_quantity.setter
+    def filled_quantity(self, value: int):
+        self._notional = self.filled_price * value
+        self._filled_quantity = value
+        self._touch()
+    
+    @property
+    def commission(self) -> float:
+        return self._commission
+    
+    @commission.setter
+    def commission(self, value: float):
+        self._commission = value
+        self._touch()
+    
+    @property
+    def create_time(self) -> datetime:
+        if isinstance(self._create_time, str):
+            self._create_time = datetime.fromisoformat(self._create_time)
+        return self._create_time
+    
+    @create_time.setter
+    def create_time(self, value: datetime):
+        self._create_time = value
+    
+    @property
+    def update_time(self) -> datetime:
+        if isinstance(self._update_time, str):
+            self._update_time = datetime.fromisoformat(self._update_time)
+        return self._update_time
+    
+    @update_time.setter
+    def update_time(self, value: datetime):
+        self._update_time = value
+    
+    @property
+    def filled_price(self) -> float:
+        if self._filled_price is None:
+            filled = self._filled_quantity
+            self._filled_price = self._notional / filled if filled > 0 else 0.0
+        return self._filled_price
+    
+    @filled_price.setter
+    def filled_price(self, value: float):
+        self._notional = value * self._filled_quantity
+        self._filled_price = value
+        self._touch()
     
     def get_filled_amount(self) -> float:
-        return self.filled_quantity * self.filled_price
+        return self._notional
     
     def update_fill(self, filled_quantity: int, filled_price: float, commission: float = 0):
-        self.filled_quantity += filled_quantity
-        self.filled_price = (self.filled_price * (self.filled_quantity - filled_quantity) + 
-                            filled_price * filled_quantity) / self.filled_quantity if self.filled_quantity > 0 else 0
-        self.commission += commission
+        self._notional += filled_price * filled_quantity
+        self._filled_quantity += filled_quantity
+        self._filled_price = None
+        self._commission += commission
         self.update_time = datetime.now()
         
-        if self.filled_quantity >= self.quantity:
-            self.status = OrderStatus.FILLED
-        elif self.filled_quantity > 0:
-            self.status = OrderStatus.PARTIAL_FILLED
+        if self._filled_quantity >= self._quantity:
+            self._status = OrderStatus.FILLED
+        elif self._filled_quantity > 0:
+            self._status = OrderStatus.PARTIAL_FILLED
+        self._touch()
     
     def cancel(self, reason: str = ""):
         if self.is_active():
@@ -111,12 +223,12 @@ class Order:
         return {
             'order_id': self.order_id,
             'symbol': self.symbol,
-            'direction': self.direction.value,
+            'direction': _DIRECTION_STR[self.direction],
             'quantity': self.quantity,
-            'order_type': self.order_type.value,
+            'order_type': _ORDER_TYPE_STR[self.order_type],
             'price': self.price,
             'stop_price': self.stop_price,
-            'status': self.status.value,
+            'status': _STATUS_STR[self.status],
             'filled_quantity': self.filled_quantity,
             'filled_price': self.filled_price,
             'commission': self.commission,
@@ -131,22 +243,23 @@ class Order:
     def from_dict(cls, data: Dict) -> 'Order':
         return cls(
             symbol=data['symbol'],
-            direction=OrderDirection(data['direction']),
+            direction=_DIRECTION_BY_STR[data['direction']],
             quantity=data['quantity'],
-            order_type=OrderType(data['order_type']),
+            order_type=_ORDER_TYPE_BY_STR[data['order_type']],
             price=data.get('price'),
             stop_price=data.get('stop_price'),
-            status=OrderStatus(data['status']),
+            status=_STATUS_BY_STR[data['status']],
             filled_quantity=data.get('filled_quantity', 0),
             filled_price=data.get('filled_price', 0.0),
             commission=data.get('commission', 0.0),
             order_id=data.get('order_id'),
             strategy_id=data.get('strategy_id'),
-            create_time=datetime.fromisoformat(data['create_time']),
-            update_time=datetime.fromisoformat(data['update_time']),
+            create_time=data['create_time'],
+            update_time=data['update_time'],
             message=data.get('message', ''),
             metadata=data.get('metadata', {})
         )
     
     def __str__(self) -> str:
-        return f"Order({self.order_id}, {self.symbol}, {self.direction.value}, {self.quantity}@{self.price}, {self.status.value})"
+        return (f"Order({self.order_id}, {self.symbol}, {_DIRECTION_STR[self.direction]}, "
+                f"{self.quantity}@{self.price}, {_STATUS_STR[self.status]})")
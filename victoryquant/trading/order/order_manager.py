@@ -3,15 +3,169 @@
 """
 from typing import Dict, List, Optional
 from datetime import datetime
+import numpy as np
 from .order import Order, OrderStatus, OrderType, OrderDirection
 
 
-class OrderManager:
+_INITIAL_CAPACITY = 1024
+_WORKING_STATUSES = frozenset((OrderStatus.SUBMITTED, OrderStatus.PARTIAL_FILLED))
+_ARROW_OBJECT_COLUMNS = ('order_id', 'symbol', 'price', 'stop_price', 'strategy_id',
+                         'create_time', 'update_time', 'message')
+_ARROW_NUMERIC_COLUMNS = ('direction', 'order_type', 'status', 'quantity', 'filled_quantity',
+                          'filled_price', 'commission')
+
+
+class _OrderBucket:
+    __slots__ = ('_ids', '_pos')
+    
     def __init__(self):
+        self._ids: List[str] = []
+        self._pos: Dict[str, int] = {}
+    
+    def append(self, order_id: str):
+        if order_id not in self._pos:
+            self._pos[order_id] = len(self._ids)
+            self._ids.append(order_id)
+    
+    def discard(self, order_id: str):
+        i = self._pos.pop(order_id, None)
+        if i is None:
+            return
+        last = self._ids.pop()
+        if i != len(self._ids):
+            self._ids[i] = last
+            self._pos[last] = i
+    
+    def clear(self):
+        self._ids.clear()
+        self._pos.clear()
+    
+    def __contains__(self, order_id: str) -> bool:
+        return order_id in self._pos
+    
+    def __iter__(self):
+        return iter(self._ids)
+    
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+class OrderManager:
+    _COLUMNS = ('_symbols', '_status', '_strategies', '_qty', '_filled_qty', '_filled_px',
+                '_commission')
+    __slots__ = ('orders', 'pending_orders', 'active_orders', 'completed_orders', '_symbol_codes',
+                 '_strategy_codes', '_capacity_hint', '_n', '_rows', '_id_to_row', '_by_symbol',
+                 '_by_strategy', '_dirty', '__weakref__') + _COLUMNS
+    
+    def __init__(self, capacity_hint: int = _INITIAL_CAPACITY):
+        self._capacity_hint = max(int(capacity_hint), 1)
         self.orders: Dict[str, Order] = {}
-        self.pending_orders: List[str] = []
-        self.active_orders: List[str] = []
-        self.completed_orders: List[str] = []
+        self.pending_orders = _OrderBucket()
+        self.active_orders = _OrderBucket()
+        self.completed_orders = _OrderBucket()
+        self._symbol_codes: Dict[str, int] = {}
+        self._strategy_codes: Dict[Optional[str], int] = {}
+        self._allocate(self._capacity_hint)
+    
+    def _allocate(self, capacity: int):
+        self._n = 0
+        self._rows: List[Order] = []
+        self._id_to_row: Dict[str, int] = {}
+        self._symbols = np.empty(capacity, dtype=np.int32)
+        self._status = np.empty(capacity, dtype=np.int8)
+        self._strategies = np.empty(capacity, dtype=np.int32)
+        self._qty = np.empty(capacity, dtype=np.int64)
+        self._filled_qty = np.empty(capacity, dtype=np.int64)
+        self._filled_px = np.empty(capacity, dtype=np.float64)
+        self._commission = np.empty(capacity, dtype=np.float64)
+        self._by_symbol: Dict[int, List[int]] = {}
+        self._by_strategy: Dict[int, List[int]] = {}
+        self._dirty = set()
+    
+    def _release(self, orders):
+        for order in orders:
+            if order._tracker is self._dirty:
+                order._tracker = None
+    
+    def _refresh(self):
+        if not self._dirty:
+            return
+        
+        id_to_row = self._id_to_row
+        for order_id in self._dirty:
+            row = id_to_row.get(order_id)
+            if row is not None:
+                self._write_row(row)
+        self._dirty.clear()
+    
+    def _grow(self):
+        capacity = 2 * len(self._status)
+        for name in self._COLUMNS:
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self._n] = old[:self._n]
+            setattr(self, name, new)
+    
+    def _append_row(self, order: Order):
+        symbol_codes = self._symbol_codes
+        strategy_codes = self._strategy_codes
+        symbol_code = symbol_codes.setdefault(order.symbol, len(symbol_codes))
+        strategy_code = strategy_codes.setdefault(order.strategy_id, len(strategy_codes))
+        
+        row = self._id_to_row.get(order.order_id)
+        if row is None:
+            if self._n == len(self._status):
+                self._grow()
+            row = self._n
+            self._id_to_row[order.order_id] = row
+            self._rows.append(order)
+            self._n += 1
+            self._by_symbol.setdefault(symbol_code, []).append(row)
+            self._by_strategy.setdefault(strategy_code, []).append(row)
+            reindex = False
+        else:
+            self._rows[row] = order
+            reindex = self._symbols[row] != symbol_code or self._strategies[row] != strategy_code
+        
+        order._tracker = self._dirty
+        self._symbols[row] = symbol_code
+        self._strategies[row] = strategy_code
+        self._sync(row)
+        if reindex:
+            self._rebuild_indexes()
+    
+    @staticmethod
+    def _group_rows(codes: np.ndarray) -> Dict[int, List[int]]:
+        rows = np.argsort(codes, kind='stable')
+        keys, starts = np.unique(codes[rows], return_index=True)
+        groups = np.split(rows, starts[1:])
+        return {key: group.tolist() for key, group in zip(keys.tolist(), groups)}
+    
+    def _rebuild_indexes(self):
+        self._by_symbol = self._group_rows(self._symbols[:self._n])
+        self._by_strategy = self._group_rows(self._strategies[:self._n])
+    
+    def _write_row(self, row: int):
+        order = self._rows[row]
+        self._status[row] = order.status
+        self._qty[row] = order.quantity
+        self._filled_qty[row] = order.filled_quantity
+        self._filled_px[row] = order.filled_price
+        self._commission[row] = order.commission
+    
+    def _sync(self, row: int):
+        self._write_row(row)
+        self._dirty.discard(self._rows[row].order_id)
+    
+    def _move(self, order_id: str, sources, target: _OrderBucket):
+        for bucket in sources:
+            bucket.discard(order_id)
+        target.append(order_id)
+        self._sync(self._id_to_row[order_id])
+    
+    def _select(self, rows: List[int]) -> List[Order]:
+        orders = self._rows
+        return [orders[row] for row in rows]
     
     def create_order(self, symbol: str, direction: OrderDirection, quantity: int,
                     order_type: OrderType, price: float = None, 
@@ -26,7 +180,11 @@ class OrderManager:
             strategy_id=strategy_id
         )
         
+        if order.order_id in self.orders:
+            raise ValueError(f"订单ID已存在: {order.order_id}")
+        
         self.orders[order.order_id] = order
+        self._append_row(order)
         self.pending_orders.append(order.order_id)
         
         return order
@@ -94,24 +252,23 @@ class OrderManager:
         return [self.orders[oid] for oid in self.completed_orders if oid in self.orders]
     
     def get_orders_by_symbol(self, symbol: str) -> List[Order]:
-        return [order for order in self.orders.values() if order.symbol == symbol]
+        code = self._symbol_codes.get(symbol)
+        return self._select(self._by_symbol.get(code, ()))
     
     def get_orders_by_strategy(self, strategy_id: str) -> List[Order]:
-        return [order for order in self.orders.values() if order.strategy_id == strategy_id]
+        code = self._strategy_codes.get(strategy_id)
+        return self._select(self._by_strategy.get(code, ()))
     
     def get_orders_by_status(self, status: OrderStatus) -> List[Order]:
-        return [order for order in self.orders.values() if order.status == status]
+        self._refresh()
+        return self._select(np.flatnonzero(self._status[:self._n] == status).tolist())
     
     def submit_order(self, order_id: str) -> bool:
         order = self.get_order(order_id)
         if order and order.status == OrderStatus.PENDING:
             order.status = OrderStatus.SUBMITTED
             order.update_time = datetime.now()
-            
-            if order_id in self.pending_orders:
-                self.pending_orders.remove(order_id)
-            self.active_orders.append(order_id)
-            
+            self._move(order_id, (self.pending_orders,), self.active_orders)
             return True
         return False
     
@@ -122,10 +279,9 @@ class OrderManager:
             order.update_fill(filled_quantity, filled_price, commission)
             
             if order.is_completed():
-                if order_id in self.active_orders:
-                    self.active_orders.remove(order_id)
-                self.completed_orders.append(order_id)
-            
+                self._move(order_id, (self.active_orders,), self.completed_orders)
+            else:
+                self._sync(self._id_to_row[order_id])
             return True
         return False
     
@@ -133,13 +289,7 @@ class OrderManager:
         order = self.get_order(order_id)
         if order and order.is_active():
             order.cancel(reason)
-            
-            if order_id in self.pending_orders:
-                self.pending_orders.remove(order_id)
-            if order_id in self.active_orders:
-                self.active_orders.remove(order_id)
-            self.completed_orders.append(order_id)
-            
+            self._move(order_id, (self.pending_orders, self.active_orders), self.completed_orders)
             return True
         return False
     
@@ -147,42 +297,155 @@ class OrderManager:
         order = self.get_order(order_id)
         if order and order.status == OrderStatus.PENDING:
             order.reject(reason)
-            
-            if order_id in self.pending_orders:
-                self.pending_orders.remove(order_id)
-            self.completed_orders.append(order_id)
-            
+            self._move(order_id, (self.pending_orders,), self.completed_orders)
             return True
         return False
     
     def cancel_all_orders(self, symbol: str = None):
-        orders_to_cancel = self.get_active_orders()
-        
+        ids = [oid for oid in self.active_orders if oid in self.orders]
+        rows = np.fromiter((self._id_to_row[oid] for oid in ids), dtype=np.int64, count=len(ids))
         if symbol:
-            orders_to_cancel = [o for o in orders_to_cancel if o.symbol == symbol]
+            code = self._symbol_codes.get(symbol)
+            rows = rows[self._symbols[rows] == code] if code is not None else rows[:0]
+        
+        for row in rows.tolist():
+            order = self._rows[row]
+            if not order.is_active():
+                continue
+            order.cancel("批量取消")
+            self.active_orders.discard(order.order_id)
+            self.completed_orders.append(order.order_id)
         
-        for order in orders_to_cancel:
-            self.cancel_order(order.order_id, "批量取消")
+        self._refresh()
     
     def get_order_statistics(self) -> Dict:
+        self._refresh()
+        counts = np.bincount(self._status[:self._n], minlength=len(OrderStatus))
         return {
             'total_orders': len(self.orders),
             'pending_orders': len(self.pending_orders),
             'active_orders': len(self.active_orders),
             'completed_orders': len(self.completed_orders),
-            'filled_orders': len([o for o in self.orders.values() if o.status == OrderStatus.FILLED]),
-            'cancelled_orders': len([o for o in self.orders.values() if o.status == OrderStatus.CANCELLED]),
-            'rejected_orders': len([o for o in self.orders.values() if o.status == OrderStatus.REJECTED])
+            'filled_orders': int(counts[OrderStatus.FILLED]),
+            'cancelled_orders': int(counts[OrderStatus.CANCELLED]),
+            'rejected_orders': int(counts[OrderStatus.REJECTED])
         }
     
     def clear_completed_orders(self):
-        for order_id in self.completed_orders[:]:
-            if order_id in self.orders:
-                del self.orders[order_id]
+        self._refresh()
+        for order_id in self.completed_orders:
+            order = self.orders.pop(order_id, None)
+            if order is not None:
+                self._release((order,))
         self.completed_orders.clear()
+        
+        orders = self.orders
+        keep = np.fromiter((order.order_id in orders for order in self._rows), dtype=bool,
+                           count=self._n)
+        rows = np.flatnonzero(keep)
+        for name in self._COLUMNS:
+            column = getattr(self, name)
+            column[:len(rows)] = column[rows]
+        self._rows = [self._rows[row] for row in rows.tolist()]
+        self._id_to_row = {order.order_id: row for row, order in enumerate(self._rows)}
+        self._n = len(rows)
+        self._rebuild_indexes()
+    
+    def to_arrow(self):
+        import pyarrow as pa
+        
+        self._refresh()
+        n = self._n
+        rows = self._rows
+        directions = np.fromiter((order.direction for order in rows), dtype=np.int8, count=n)
+        order_types = np.fromiter((order.order_type for order in rows), dtype=np.int8, count=n)
+        strategies = pa.array([order.strategy_id for order in rows], pa.string())
+        return pa.table({
+            'order_id': pa.array([order.order_id for order in rows], pa.string()),
+            'symbol': pa.DictionaryArray.from_arrays(
+                pa.array(self._symbols[:n]), pa.array(list(self._symbol_codes), pa.string())
+            ),
+            'direction': pa.array(directions),
+            'order_type': pa.array(order_types),
+            'price': pa.array([order.price for order in rows], pa.float64()),
+            'stop_price': pa.array([order.stop_price for order in rows], pa.float64()),
+            'status': pa.array(self._status[:n]),
+            'quantity': pa.array(self._qty[:n]),
+            'filled_quantity': pa.array(self._filled_qty[:n]),
+            'filled_price': pa.array(self._filled_px[:n]),
+            'commission': pa.array(self._commission[:n]),
+            'strategy_id': strategies.dictionary_encode(),
+            'create_time': pa.array([order.create_time for order in rows], pa.timestamp('us')),
+            'update_time': pa.array([order.update_time for order in rows], pa.timestamp('us')),
+            'message': pa.array([order.message for order in rows], pa.string())
+        })
+    
+    @classmethod
+    def from_arrow(cls, table) -> 'OrderManager':
+        n = table.num_rows
+        manager = cls(capacity_hint=max(_INITIAL_CAPACITY, n))
+        
+        numeric = {name: table.column(name).to_numpy() for name in _ARROW_NUMERIC_COLUMNS}
+        manager._status[:n] = numeric['status']
+        manager._qty[:n] = numeric['quantity']
+        manager._filled_qty[:n] = numeric['filled_quantity']
+        manager._filled_px[:n] = numeric['filled_price']
+        manager._commission[:n] = numeric['commission']
+        
+        directions = tuple(OrderDirection)
+        order_types = tuple(OrderType)
+        statuses = tuple(OrderStatus)
+        columns = zip(
+            *(table.column(name).to_pylist() for name in _ARROW_OBJECT_COLUMNS),
+            *(numeric[name].tolist() for name in _ARROW_NUMERIC_COLUMNS)
+        )
+        
+        symbol_codes = manager._symbol_codes
+        strategy_codes = manager._strategy_codes
+        for row, (order_id, symbol, price, stop_price, strategy_id, create_time, update_time,
+                  message, direction, order_type, status, quantity, filled_quantity, filled_price,
+                  commission) in enumerate(columns):
+            order = Order(
+                symbol=symbol,
+                direction=directions[direction],
+                quantity=quantity,
+                order_type=order_types[order_type],
+                price=price,
+                stop_price=stop_price,
+                status=statuses[status],
+                filled_quantity=filled_quantity,
+                filled_price=filled_price,
+                commission=commission,
+                order_id=order_id,
+                strategy_id=strategy_id,
+                create_time=create_time,
+                update_time=update_time,
+                message=message
+            )
+            order._tracker = manager._dirty
+            manager.orders[order_id] = order
+            manager._rows.append(order)
+            manager._id_to_row[order_id] = row
+            manager._symbols[row] = symbol_codes.setdefault(symbol, len(symbol_codes))
+            manager._strategies[row] = strategy_codes.setdefault(strategy_id, len(strategy_codes))
+            
+            if order.status == OrderStatus.PENDING:
+                manager.pending_orders.append(order_id)
+            elif order.status in _WORKING_STATUSES:
+                manager.active_orders.append(order_id)
+            else:
+                manager.completed_orders.append(order_id)
+        
+        manager._n = n
+        manager._rebuild_indexes()
+        return manager
     
     def reset(self):
+        self._release(self._rows)
         self.orders.clear()
         self.pending_orders.clear()
         self.active_orders.clear()
         self.completed_orders.clear()
+        self._symbol_codes.clear()
+        self._strategy_codes.clear()
+        self._allocate(self._capacity_hint)
@@ -0,0 +1,48 @@
+"""
+列式缓冲工具
+"""
+from typing import Sequence
+import numpy as np
+
+
+class GrowableArray:
+    __slots__ = ('_data', '_size')
+    
+    def __init__(self, dtype, capacity: int = 64):
+        self._data = np.empty(max(int(capacity), 1), dtype=dtype)
+        self._size = 0
+    
+    def append(self, row):
+        if self._size == len(self._data):
+            grown = np.empty(2 * len(self._data), dtype=self._data.dtype)
+            grown[:self._size] = self._data
+            self._data = grown
+        
+        self._data[self._size] = row
+        self._size += 1
+    
+    @property
+    def values(self) -> np.ndarray:
+        return self._data[:self._size]
+    
+    def __len__(self) -> int:
+        return self._size
+
+
+class RecordSequence(Sequence):
+    def _materialize(self, i: int):
+        raise NotImplementedError
+    
+    def __getitem__(self, index):
+        size = len(self)
+        if isinstance(index, slice):
+            return [self._materialize(i) for i in range(*index.indices(size))]
+        
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("record index out of range")
+        return self._materialize(index)
+    
+    def __iter__(self):
+        return (self._materialize(i) for i in range(len(self)))
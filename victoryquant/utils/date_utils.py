@@ -1,45 +1,78 @@
 """
 日期工具
 """
-from datetime import datetime, timedelta
-from typing import List, Optional
+from datetime import datetime, timedelta, time as dtime
+from functools import lru_cache
+from typing import FrozenSet, List, Optional, Tuple
+import numpy as np
 import pandas as pd
 
 
+_MORNING_START = dtime(9, 30)
+_MORNING_END = dtime(11, 30)
+_AFTERNOON_START = dtime(13, 0)
+_AFTERNOON_END = dtime(15, 0)
+
+
+def _to_ordinal(date: str) -> int:
+    return int(np.datetime64(date, 'D').astype(np.int64))
+
+
+def _to_strings(ordinals) -> List[str]:
+    return np.asarray(ordinals, dtype=np.int64).astype('datetime64[D]').astype(str).tolist()
+
+
+def _is_weekday(ordinals):
+    return (ordinals + 3) % 7 < 5
+
+
+def _weekday_ordinals(start: int, end: int) -> np.ndarray:
+    days = np.arange(start, end + 1, dtype=np.int64)
+    return days[_is_weekday(days)]
+
+
+def _step_weekday(ordinal: int, step: int) -> int:
+    ordinal += step
+    while not _is_weekday(ordinal):
+        ordinal += step
+    return ordinal
+
+
+@lru_cache(maxsize=1)
+def _load_calendar() -> Tuple[np.ndarray, FrozenSet[int]]:
+    import akshare as ak
+    df = ak.tool_trade_date_hist_sina()
+    days = pd.to_datetime(df['trade_date']).to_numpy().astype('datetime64[D]')
+    calendar = np.sort(days.astype(np.int64))
+    calendar.setflags(write=False)
+    return calendar, frozenset(calendar.tolist())
+
+
 class DateUtils:
     @staticmethod
     def get_trading_dates(start_date: str, end_date: str) -> List[str]:
         try:
-            import akshare as ak
-            df = ak.tool_trade_date_hist_sina()
-            dates = df[(df['trade_date'] >= start_date) & (df['trade_date'] <= end_date)]
-            return dates['trade_date'].tolist()
+            calendar = _load_calendar()[0]
         except Exception:
             return DateUtils._generate_weekdays(start_date, end_date)
+        
+        lo = np.searchsorted(calendar, _to_ordinal(start_date))
+        hi = np.searchsorted(calendar, _to_ordinal(end_date), side='right')
+        return _to_strings(calendar[lo:hi])
     
     @staticmethod
     def _generate_weekdays(start_date: str, end_date: str) -> List[str]:
-        start = datetime.strptime(start_date, '%Y-%m-%d')
-        end = datetime.strptime(end_date, '%Y-%m-%d')
-        
-        weekdays = []
-        current = start
-        while current <= end:
-            if current.weekday() < 5:
-                weekdays.append(current.strftime('%Y-%m-%d'))
-            current += timedelta(days=1)
-        
-        return weekdays
+        return _to_strings(_weekday_ordinals(_to_ordinal(start_date), _to_ordinal(end_date)))
     
     @staticmethod
     def is_trading_day(date: str) -> bool:
+        ordinal = _to_ordinal(date)
         try:
-            import akshare as ak
-            df = ak.tool_trade_date_hist_sina()
-            return date in df['trade_date'].values
+            trading_days = _load_calendar()[1]
         except Exception:
-            dt = datetime.strptime(date, '%Y-%m-%d')
-            return dt.weekday() < 5
+            return bool(_is_weekday(ordinal))
+        
+        return ordinal in trading_days
     
     @staticmethod
     def is_trading_time(dt: datetime = None) -> bool:
@@ -50,36 +83,43 @@ class DateUtils:
             return False
         
         time_val = dt.time()
-        morning_start = datetime.strptime("09:30", "%H:%M").time()
-        morning_end = datetime.strptime("11:30", "%H:%M").time()
-        afternoon_start = datetime.strptime("13:00", "%H:%M").time()
-        afternoon_end = datetime.strptime("15:00", "%H:%M").time()
+        return (_MORNING_START <= time_val <= _MORNING_END) or \
+               (_AFTERNOON_START <= time_val <= _AFTERNOON_END)
+    
+    @staticmethod
+    def _step_trading_day(date: str, step: int) -> str:
+        ordinal = _to_ordinal(date)
+        try:
+            calendar = _load_calendar()[0]
+        except Exception:
+            return _to_strings([_step_weekday(ordinal, step)])[0]
         
-        return (morning_start <= time_val <= morning_end) or \
-               (afternoon_start <= time_val <= afternoon_end)
+        if step > 0:
+            i = np.searchsorted(calendar, ordinal, side='right')
+        else:
+            i = np.searchsorted(calendar, ordinal) - 1
+        if 0 <= i < len(calendar):
+            return _to_strings(calendar[i:i + 1])[0]
+        return _to_strings([_step_weekday(ordinal, step)])[0]
     
     @staticmethod
     def get_next_trading_day(date: str) -> str:
-        dt = datetime.strptime(date, '%Y-%m-%d')
-        
-        while True:
-            dt += timedelta(days=1)
-            if DateUtils.is_trading_day(dt.strftime('%Y-%m-%d')):
-                return dt.strftime('%Y-%m-%d')
+        return DateUtils._step_trading_day(date, 1)
     
     @staticmethod
     def get_previous_trading_day(date: str) -> str:
-        dt = datetime.strptime(date, '%Y-%m-%d')
-        
-        while True:
-            dt -= timedelta(days=1)
-            if DateUtils.is_trading_day(dt.strftime('%Y-%m-%d')):
-                return dt.strftime('%Y-%m-%d')
+        return DateUtils._step_trading_day(date, -1)
     
     @staticmethod
     def get_trading_days_between(start_date: str, end_date: str) -> int:
-        trading_dates = DateUtils.get_trading_dates(start_date, end_date)
-        return len(trading_dates)
+        try:
+            calendar = _load_calendar()[0]
+        except Exception:
+            start, end = _to_ordinal(start_date), _to_ordinal(end_date)
+            return len(_weekday_ordinals(start, end))
+        
+        return int(np.searchsorted(calendar, _to_ordinal(end_date), side='right') - 
+                   np.searchsorted(calendar, _to_ordinal(start_date)))
     
     @staticmethod
     def date_to_str(date: datetime, fmt: str = '%Y-%m-%d') -> str:
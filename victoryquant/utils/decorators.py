@@ -2,15 +2,22 @@
 装饰器工具
 """
 import time
+import random
+import logging
 import functools
-from typing import Callable, Any
+import threading
+from collections import OrderedDict
+from typing import Callable, Any, Optional
 from .logger import get_logger
 
 logger = get_logger()
 
+_MISSING = object()
+
 
 def retry(max_attempts: int = 3, delay: float = 1.0, 
-          exceptions: tuple = (Exception,)):
+          exceptions: tuple = (Exception,), backoff: float = 2.0,
+          jitter: float = 0.1, max_delay: float = 60.0):
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
         def wrapper(*args, **kwargs) -> Any:
@@ -21,15 +28,12 @@ def retry(max_attempts: int = 3, delay: float = 1.0,
                     return func(*args, **kwargs)
                 except exceptions as e:
                     last_exception = e
-                    logger.warning(
-                        f"函数 {func.__name__} 第 {attempt + 1} 次执行失败: {e}"
-                    )
+                    logger.warning("函数 %s 第 %d 次执行失败: %s", func.__name__, attempt + 1, e)
                     if attempt < max_attempts - 1:
-                        time.sleep(delay)
+                        sleep_for = min(delay * backoff ** attempt, max_delay)
+                        time.sleep(sleep_for + random.random() * delay * jitter)
             
-            logger.error(
-                f"函数 {func.__name__} 执行失败，已重试 {max_attempts} 次"
-            )
+            logger.error("函数 %s 执行失败，已重试 %d 次", func.__name__, max_attempts)
             raise last_exception
         
         return wrapper
@@ -39,12 +43,13 @@ def retry(max_attempts: int = 3, delay: float = 1.0,
 def timing(func: Callable) -> Callable:
     @functools.wraps(func)
     def wrapper(*args, **kwargs) -> Any:
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         result = func(*args, **kwargs)
-        end_time = time.time()
+        end_time = time.perf_counter_ns()
         
-        execution_time = end_time - start_time
-        logger.info(f"函数 {func.__name__} 执行时间: {execution_time:.4f} 秒")
+        if logger.isEnabledFor(logging.INFO):
+            execution_time = (end_time - start_time) / 1e9
+            logger.info("函数 %s 执行时间: %.4f 秒", func.__name__, execution_time)
         
         return result
     
@@ -54,27 +59,50 @@ def timing(func: Callable) -> Callable:
 def log_call(func: Callable) -> Callable:
     @functools.wraps(func)
     def wrapper(*args, **kwargs) -> Any:
-        logger.debug(f"调用函数 {func.__name__}, 参数: {args}, 关键字参数: {kwargs}")
+        logger.debug("调用函数 %s, 参数: %s, 关键字参数: %s", func.__name__, args, kwargs)
         result = func(*args, **kwargs)
-        logger.debug(f"函数 {func.__name__} 返回: {result}")
+        logger.debug("函数 %s 返回: %s", func.__name__, result)
         return result
     
     return wrapper
 
 
-def cache_result(func: Callable) -> Callable:
-    cache = {}
+def _cache_key(args: tuple, kwargs: dict):
+    items = tuple(sorted(kwargs.items()))
+    key = (args, items, tuple(type(v) for v in args), tuple(type(v) for _, v in items))
+    try:
+        hash(key)
+    except TypeError:
+        return str(args) + str(sorted(kwargs.items()))
+    return key
+
+
+def cache_result(func: Optional[Callable] = None, maxsize: int = 1024) -> Callable:
+    if func is None:
+        return functools.partial(cache_result, maxsize=maxsize)
+    
+    cache = OrderedDict()
+    lock = threading.Lock()
     
     @functools.wraps(func)
     def wrapper(*args, **kwargs) -> Any:
-        key = str(args) + str(sorted(kwargs.items()))
+        key = _cache_key(args, kwargs)
         
-        if key in cache:
-            logger.debug(f"从缓存返回 {func.__name__} 结果")
-            return cache[key]
+        with lock:
+            result = cache.get(key, _MISSING)
+            if result is not _MISSING:
+                cache.move_to_end(key)
+        if result is not _MISSING:
+            logger.debug("从缓存返回 %s 结果", func.__name__)
+            return result
         
         result = func(*args, **kwargs)
-        cache[key] = result
+        with lock:
+            cache[key] = result
+            cache.move_to_end(key)
+            if len(cache) > maxsize:
+                cache.popitem(last=False)
         return result
     
+    wrapper.cache_clear = cache.clear
     return wrapper
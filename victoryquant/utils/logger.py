@@ -1,50 +1,88 @@
 """
 日志工具
 """
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import sys
+import threading
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
 
 
-def setup_logger(name: str = "VictoryQuant", 
-                log_file: Optional[str] = None,
-                level: int = logging.INFO) -> logging.Logger:
-    logger = logging.getLogger(name)
-    
-    if logger.handlers:
-        return logger
-    
-    logger.setLevel(level)
-    
-    formatter = logging.Formatter(
+_ROOT_LOGGER = "VictoryQuant"
+_setup_lock = threading.Lock()
+_listeners = {}
+
+
+def _stop_listeners():
+    for listener in _listeners.values():
+        listener.stop()
+    _listeners.clear()
+
+
+atexit.register(_stop_listeners)
+
+
+def _formatter() -> logging.Formatter:
+    return logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
+
+
+def _add_file_sink(logger: logging.Logger, log_file: str, level: int):
+    key = (logger.name, os.path.abspath(log_file))
+    if key in _listeners:
+        return
+    
+    log_dir = os.path.dirname(log_file)
+    if log_dir and not os.path.exists(log_dir):
+        os.makedirs(log_dir)
+    
+    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+    file_handler.setLevel(level)
+    file_handler.setFormatter(_formatter())
+    
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setLevel(level)
+    logger.addHandler(queue_handler)
+    
+    listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    _listeners[key] = listener
+
+
+def setup_logger(name: str = "VictoryQuant", 
+                log_file: Optional[str] = None,
+                level: int = logging.INFO,
+                enable_file: bool = False) -> logging.Logger:
+    logger = logging.getLogger(name)
     
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(level)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    if enable_file and not log_file:
+        log_file = f"logs/victoryquant_{datetime.now().strftime('%Y%m%d')}.log"
     
-    if log_file:
-        log_dir = os.path.dirname(log_file)
-        if log_dir and not os.path.exists(log_dir):
-            os.makedirs(log_dir)
+    with _setup_lock:
+        if not logger.handlers:
+            logger.setLevel(level)
+            if not log_file or (sys.stderr is not None and sys.stderr.isatty()):
+                console_handler = logging.StreamHandler()
+                console_handler.setLevel(level)
+                console_handler.setFormatter(_formatter())
+                logger.addHandler(console_handler)
         
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
-        file_handler.setLevel(level)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        if log_file:
+            _add_file_sink(logger, log_file, level)
     
     return logger
 
 
-def get_logger(name: str = "VictoryQuant") -> logging.Logger:
+@lru_cache(maxsize=None)
+def get_logger(name: str = _ROOT_LOGGER) -> logging.Logger:
+    if name == _ROOT_LOGGER or name.startswith(_ROOT_LOGGER + '.'):
+        setup_logger(_ROOT_LOGGER)
     return logging.getLogger(name)
-
-
-default_logger = setup_logger(
-    "VictoryQuant",
-    log_file=f"logs/victoryquant_{datetime.now().strftime('%Y%m%d')}.log"
-)